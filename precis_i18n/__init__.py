@@ -1,5 +1,30 @@
 """PRECIS-i18n: Internationalized Usernames and Passwords."""
 
+import sys
+
 __version__ = "1.1.1"
 
-from precis_i18n.factory import get_profile as get_profile  # noqa: F401
+__all__ = ["get_profile", "register_profile", "warm_up"]
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        """Import the profile factory on first use (PEP 562).
+
+        `import precis_i18n` doesn't import the profile modules until one of
+        the functions in `__all__` is first accessed.
+        """
+        if name in __all__:
+            from precis_i18n import factory
+
+            value = globals()[name] = getattr(factory, name)
+            return value
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
+
+else:  # pragma: no cover
+    from precis_i18n.factory import get_profile as get_profile  # noqa: F401
+    from precis_i18n.factory import register_profile as register_profile  # noqa: F401
+    from precis_i18n.factory import warm_up as warm_up  # noqa: F401
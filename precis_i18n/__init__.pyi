@@ -1,3 +1,5 @@
 from precis_i18n.factory import get_profile as get_profile
+from precis_i18n.factory import register_profile as register_profile
+from precis_i18n.factory import warm_up as warm_up
 
 __version__: str
@@ -0,0 +1,149 @@
+"""Implements asyncio helpers for enforcing profiles from an event loop."""
+
+import asyncio
+import collections
+import itertools
+
+from precis_i18n.parallel import _enforce_chunk
+
+# Values, or chunks of values, with at most this many characters in total are
+# enforced inline on the event loop. Larger ones are run in an executor.
+INLINE_THRESHOLD = 1000
+
+
+async def enforce_async(profile, value, *, threshold=None, executor=None):
+    """Enforce `profile` on `value` without stalling the event loop.
+
+    If `value` has at most `threshold` characters, it's enforced inline.
+    Otherwise, it's enforced in `executor`.
+
+    Args:
+        profile (Union[Profile, BaseClass]): PRECIS profile.
+        value (Union[str, bytes]): String value to enforce.
+        threshold (Optional[int]): Maximum length enforced inline. The
+            default is `INLINE_THRESHOLD`.
+        executor (Optional[Executor]): Executor for long values. The default
+            is the event loop's default executor.
+
+    Returns:
+        str: Enforced value.
+
+    Raises:
+        UnicodeEncodeError: Value is disallowed by the profile.
+        ValueError: `value` not a string or bytes.
+    """
+    if threshold is None:
+        threshold = INLINE_THRESHOLD
+    if _size(value) <= threshold:
+        return profile.enforce(value)
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, profile.enforce, value)
+
+
+def enforce_stream(
+    profile, values, *, chunksize=100, max_pending=2, threshold=None, executor=None
+):
+    """Enforce `profile` on each value in `values`, as an async iterator.
+
+    Use `async for result, error in enforce_stream(profile, values)`. Each
+    item is a 2-tuple (result, error) in the same order as `values`, like
+    the lists returned by `Profile.enforce_many`: the enforced string and
+    None, or None and the exception that `enforce` would have raised.
+
+    The values are enforced in chunks of `chunksize` values. A chunk with at
+    most `threshold` characters in total is enforced inline; a larger chunk
+    is enforced in `executor`. At most `max_pending` chunks are read ahead
+    of the consumer, so a slow consumer applies backpressure to `values`.
+
+    Args:
+        profile (Union[Profile, BaseClass]): PRECIS profile.
+        values (Union[Iterable, AsyncIterable]): String values to enforce.
+        chunksize (int): Number of values enforced at a time.
+        max_pending (int): Maximum number of chunks read ahead.
+        threshold (Optional[int]): Maximum characters in a chunk enforced
+            inline. The default is `INLINE_THRESHOLD`.
+        executor (Optional[Executor]): Executor for large chunks. The default
+            is the event loop's default executor.
+
+    Returns:
+        AsyncIterator[Tuple[Optional[str], Optional[ValueError]]]: Results.
+
+    Raises:
+        ValueError: `chunksize` or `max_pending` is less than 1.
+    """
+    if chunksize < 1 or max_pending < 1:
+        raise ValueError("chunksize and max_pending must be at least 1")
+    if threshold is None:
+        threshold = INLINE_THRESHOLD
+    return _EnforceStream(profile, values, chunksize, max_pending, threshold, executor)
+
+
+class _EnforceStream:
+    """Async iterator returned by `enforce_stream`."""
+
+    def __init__(self, profile, values, chunksize, max_pending, threshold, executor):
+        self._profile = profile
+        if hasattr(values, "__aiter__"):
+            self._source = values.__aiter__()
+            self._sync_source = None
+        else:
+            self._source = None
+            self._sync_source = iter(values)
+        self._chunksize = chunksize
+        self._max_pending = max_pending
+        self._threshold = threshold
+        self._executor = executor
+        # Futures for the results of each chunk, in input order.
+        self._pending = collections.deque()
+        self._ready = collections.deque()
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._ready:
+            while not self._done and len(self._pending) < self._max_pending:
+                chunk = await self._read_chunk()
+                if chunk:
+                    self._pending.append(self._submit(chunk))
+                    # Let other tasks run between chunks enforced inline.
+                    await asyncio.sleep(0)
+            if not self._pending:
+                raise StopAsyncIteration
+            results, errors = await self._pending.popleft()
+            self._ready.extend(zip(results, errors))
+        return self._ready.popleft()
+
+    async def _read_chunk(self):
+        """Read the next chunk of values from the source."""
+        if self._sync_source is not None:
+            chunk = list(itertools.islice(self._sync_source, self._chunksize))
+        else:
+            chunk = []
+            while len(chunk) < self._chunksize:
+                try:
+                    chunk.append(await self._source.__anext__())
+                except StopAsyncIteration:
+                    break
+        if len(chunk) < self._chunksize:
+            self._done = True
+        return chunk
+
+    def _submit(self, chunk):
+        """Return a future for the results of enforcing `chunk`."""
+        loop = asyncio.get_event_loop()
+        if sum(_size(value) for value in chunk) <= self._threshold:
+            future = loop.create_future()
+            future.set_result(_enforce_chunk(self._profile, chunk))
+            return future
+        return loop.run_in_executor(
+            self._executor, _enforce_chunk, self._profile, chunk
+        )
+
+
+def _size(value):
+    """Return the length of a str or bytes value, or 0 for other objects."""
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    return 0
@@ -0,0 +1,24 @@
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Optional, Tuple, Union
+
+from precis_i18n.baseclass import BaseClass
+from precis_i18n.profile import Profile
+
+INLINE_THRESHOLD: int
+
+async def enforce_async(
+    profile: Union[Profile, BaseClass],
+    value: Union[bytes, str],
+    *,
+    threshold: Optional[int] = ...,
+    executor: Optional[Executor] = ...
+) -> str: ...
+def enforce_stream(
+    profile: Union[Profile, BaseClass],
+    values: Union[Iterable[Any], AsyncIterable[Any]],
+    *,
+    chunksize: int = ...,
+    max_pending: int = ...,
+    threshold: Optional[int] = ...,
+    executor: Optional[Executor] = ...
+) -> AsyncIterator[Tuple[Optional[str], Optional[ValueError]]]: ...
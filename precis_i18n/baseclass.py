@@ -1,7 +1,28 @@
 """Implements the PRECIS string classes."""
 
+import collections
+
+from precis_i18n.bidi import bidi_rule_failed
 from precis_i18n.context import context_rule_error
 from precis_i18n.derived import CONTEXTJ, CONTEXTO, FREE_PVAL, PVALID, derived_property
+from precis_i18n.warmup import measure
+
+CheckResult = collections.namedtuple("CheckResult", ["ok", "value", "kind", "offset"])
+CheckResult.__doc__ = """Result of `check`.
+
+If `ok` is true, `value` is the enforced value, and `kind` and `offset` are
+None. Otherwise, `kind` is the subtype of error detected, and `offset` is its
+position in `value`, or -1 to indicate the entire string.
+"""
+
+Report = collections.namedtuple("Report", ["value", "errors"])
+Report.__doc__ = """Result of `enforce_report`.
+
+If `errors` is empty, `value` is the enforced value. Otherwise, `value` is the
+string that the error offsets refer to, and `errors` is a list of 2-tuples
+(offset, kind) for every violation. An offset of -1 refers to the entire
+string.
+"""
 
 
 class BaseClass:
@@ -42,6 +63,124 @@ class BaseClass:
         if codec_name is None:
             codec_name = self.name
 
+        for i, kind in self._violations(value):
+            raise_error(codec_name, value, i, kind)
+
+        return value
+
+    def check(self, value, bidi=False):
+        """Check `value` against the string class without raising an exception.
+
+        If `bidi` is true, the BiDi Rule is checked in the same pass over
+        `value` when it contains RTL characters. A failure of the BiDi Rule is
+        reported instead of any disallowed character, with kind 'bidi_rule'
+        and offset -1.
+
+        Args:
+            value (str): String value to check.
+            bidi (bool): Also check the BiDi Rule.
+
+        Returns:
+            CheckResult: Named tuple (ok, value, kind, offset).
+        """
+        if bidi:
+            return self._check_bidi(value)
+        for i, kind in self._violations(value):
+            return CheckResult(False, value, kind, i)
+        return CheckResult(True, value, None, None)
+
+    def is_valid(self, value):
+        """Return true if all characters in `value` are allowed.
+
+        Args:
+            value (str): String value to check.
+
+        Returns:
+            bool: True if `enforce` would succeed.
+        """
+        for _ in self._violations(value):
+            return False
+        return True
+
+    def enforce_report(self, value):
+        """Report every character in `value` not allowed by the string class.
+
+        Args:
+            value (str): String value to check.
+
+        Returns:
+            Report: Named tuple (value, errors).
+        """
+        return Report(value, list(self._violations(value)))
+
+    def warm(self, scripts=None, *, trace_memory=False):
+        """Build the tables that are otherwise built on first use.
+
+        Args:
+            scripts (Optional[Iterable[str]]): Script names whose context rule
+                tables are built. The default is all scripts.
+            trace_memory (bool): Measure memory using `tracemalloc`, which
+                makes warming about ten times slower.
+
+        Returns:
+            WarmUpReport: Named tuple (seconds, memory).
+
+        Raises:
+            ValueError: Unknown script name.
+        """
+        return measure(self.ucd.warm, scripts, trace_memory=trace_memory)
+
+    def _check_bidi(self, value):
+        """Check `value` against the string class and the BiDi Rule.
+
+        The BiDi properties needed by the rule are collected in the same loop
+        that checks the derived property of each character.
+
+        Args:
+            value (str): String value to check.
+
+        Returns:
+            CheckResult: Named tuple (ok, value, kind, offset).
+        """
+        ucd = self.ucd
+        bidirectional = ucd.bidirectional
+        allowed = self._allowed
+        seen = set()
+        add_seen = seen.add
+        last = None
+        violation = None
+        memo = {}
+        for i, char in enumerate(value):
+            bidi = bidirectional(char)
+            add_seen(bidi)
+            if bidi != "NSM":
+                last = bidi
+            if violation is None:
+                prop, kind = derived_property(ord(char), ucd)
+                if prop in allowed:
+                    continue
+                if prop in (CONTEXTJ, CONTEXTO):
+                    kind = context_rule_error(value, i, ucd, memo)
+                    if not kind:
+                        continue
+                violation = (i, kind)
+        if value and bidi_rule_failed(bidirectional(value[0]), seen, last):
+            return CheckResult(False, value, "bidi_rule", -1)
+        if violation:
+            return CheckResult(False, value, violation[1], violation[0])
+        return CheckResult(True, value, None, None)
+
+    def _violations(self, value):
+        """Generate the disallowed characters in `value`.
+
+        Args:
+            value (str): String value to check.
+
+        Yields:
+            Tuple[int, str]: Offset and kind of each violation.
+        """
+        # Results of context rules that test the entire string.
+        memo = {}
         for i, char in enumerate(value):
             prop, kind = derived_property(ord(char), self.ucd)
             if prop in self._allowed:
@@ -50,13 +189,11 @@ class BaseClass:
             if prop in (CONTEXTJ, CONTEXTO):
                 # Replace `kind` ('exceptions', 'join_control') with the
                 # specific name of the context rule, if the rule fails.
-                kind = context_rule_error(value, i, self.ucd)
+                kind = context_rule_error(value, i, self.ucd, memo)
                 if not kind:
                     continue
 
-            raise_error(codec_name, value, i, kind)
-
-        return value
+            yield i, kind
 
 
 class IdentifierClass(BaseClass):
@@ -94,6 +231,22 @@ def raise_error(encoding, value, offset, error):
     Raises:
         UnicodeEncodeError: Always.
     """
+    raise make_error(encoding, value, offset, error)
+
+
+def make_error(encoding, value, offset, error):
+    """Return specially formatted UnicodeEncodeError exception.
+
+    Args:
+        encoding (str): Name of the encoding/codec.
+        value (str): Value being encoded.
+        offset (int): Offset in `value` where error detected. Use -1 to
+            indicate the entire string.
+        error (str): Subtype of error detected.
+
+    Returns:
+        UnicodeEncodeError: Exception to raise.
+    """
     if offset < 0:
         start = 0
         end = len(value)
@@ -102,4 +255,16 @@ def raise_error(encoding, value, offset, error):
         end = offset + 1
 
     reason = "DISALLOWED/%s" % error
-    raise UnicodeEncodeError(encoding, value, start, end, reason)
+    return UnicodeEncodeError(encoding, value, start, end, reason)
+
+
+def error_kind(ex):
+    """Return the subtype of error from an exception raised by `raise_error`.
+
+    Args:
+        ex (UnicodeEncodeError): Exception raised by `raise_error`.
+
+    Returns:
+        str: Subtype of error detected.
+    """
+    return ex.reason.partition("/")[2] or ex.reason
@@ -1,6 +1,17 @@
-from typing import NoReturn, Optional, Tuple
+from typing import Iterable, List, NamedTuple, NoReturn, Optional, Tuple
 
 from precis_i18n.unicode import UnicodeData
+from precis_i18n.warmup import WarmUpReport
+
+class CheckResult(NamedTuple):
+    ok: bool
+    value: str
+    kind: Optional[str]
+    offset: Optional[int]
+
+class Report(NamedTuple):
+    value: str
+    errors: List[Tuple[int, str]]
 
 class BaseClass:
     ucd: UnicodeData
@@ -8,6 +19,12 @@ class BaseClass:
 
     def __init__(self, ucd: UnicodeData, name: str = ...) -> None: ...
     def enforce(self, value: str, codec_name: Optional[str] = ...) -> str: ...
+    def check(self, value: str, bidi: bool = ...) -> CheckResult: ...
+    def is_valid(self, value: str) -> bool: ...
+    def enforce_report(self, value: str) -> Report: ...
+    def warm(
+        self, scripts: Optional[Iterable[str]] = ..., *, trace_memory: bool = ...
+    ) -> WarmUpReport: ...
 
 class IdentifierClass(BaseClass):
     _allowed: Tuple[str]
@@ -16,3 +33,7 @@ class FreeFormClass(BaseClass):
     _allowed: Tuple[str, str]
 
 def raise_error(encoding: str, value: str, offset: int, error: str) -> NoReturn: ...
+def make_error(
+    encoding: str, value: str, offset: int, error: str
+) -> UnicodeEncodeError: ...
+def error_kind(ex: UnicodeEncodeError) -> str: ...
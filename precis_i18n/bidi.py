@@ -29,17 +29,17 @@ the rule to be satisfied.
    Bidi property NSM.
 """
 
-_LTR_FIRST = {"L"}
-_LTR_ALLOWED = {"L", "EN", "ES", "CS", "ET", "ON", "BN", "NSM"}
-_LTR_LAST = {"L", "EN"}
-_LTR_EXCL = set()
+_LTR_FIRST = frozenset({"L"})
+_LTR_ALLOWED = frozenset({"L", "EN", "ES", "CS", "ET", "ON", "BN", "NSM"})
+_LTR_LAST = frozenset({"L", "EN"})
+_LTR_EXCL = frozenset()
 
-_RTL_FIRST = {"R", "AL"}
-_RTL_ALLOWED = {"R", "AL", "AN", "EN", "ES", "CS", "ET", "ON", "BN", "NSM"}
-_RTL_LAST = {"R", "AL", "EN", "AN"}
-_RTL_EXCL = {"EN", "AN"}
+_RTL_FIRST = frozenset({"R", "AL"})
+_RTL_ALLOWED = frozenset({"R", "AL", "AN", "EN", "ES", "CS", "ET", "ON", "BN", "NSM"})
+_RTL_LAST = frozenset({"R", "AL", "EN", "AN"})
+_RTL_EXCL = frozenset({"EN", "AN"})
 
-_RTL_ANY = {"R", "AL", "AN"}
+_RTL_ANY = frozenset({"R", "AL", "AN"})
 
 
 def bidi_rule(value, ucd):
@@ -104,6 +104,31 @@ def _bidi_rule(value, ucd, allowed, last, exclusive):
     return True
 
 
+def bidi_rule_failed(first, seen, last):
+    """Check the BiDi Rule using properties collected in a single pass.
+
+    A string that contains an RTL character can't be an LTR label, so only
+    the conditions for an RTL label are checked. The result is equivalent to
+    `has_rtl(value) and not bidi_rule(value)`.
+
+    Args:
+        first (str): BiDi property of the first character.
+        seen (set): BiDi properties of all characters.
+        last (str): BiDi property of the last character that is not NSM.
+
+    Returns:
+        bool: True if the string contains RTL characters and fails the rule.
+    """
+    if seen.isdisjoint(_RTL_ANY):
+        return False
+    return not (
+        first in _RTL_FIRST
+        and seen <= _RTL_ALLOWED
+        and last in _RTL_LAST
+        and not _RTL_EXCL <= seen
+    )
+
+
 def has_rtl(value, ucd):
     """Check if value contains any RTL characters.
 
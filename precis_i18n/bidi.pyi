@@ -1,4 +1,4 @@
-from typing import Set
+from typing import Optional, Set
 
 from precis_i18n.unicode import UnicodeData
 
@@ -12,5 +12,6 @@ _RTL_LAST = Set[str]
 _RTL_EXCL = Set[str]
 _RTL_ANY = Set[str]
 
+def bidi_rule_failed(first: str, seen: Set[str], last: Optional[str]) -> bool: ...
 def bidi_rule(value: str, ucd: UnicodeData) -> bool: ...
 def has_rtl(value: str, ucd: UnicodeData) -> bool: ...
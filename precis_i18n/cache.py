@@ -0,0 +1,134 @@
+"""Implements the EnforcementCache class."""
+
+import collections
+import threading
+
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
+# Caches with at least this many entries per shard are split into shards, up
+# to `_MAX_SHARDS`. Smaller caches use one shard, which is an exact LRU cache.
+_SHARD_SIZE = 256
+_MAX_SHARDS = 16
+
+
+class EnforcementCache:
+    """Thread-safe bounded LRU cache of enforcement results.
+
+    Each entry maps an input string to its `CheckResult`. Exceptions
+    themselves are not cached, so each hit on a rejected value raises a fresh
+    exception.
+
+    A large cache is split into shards by the hash of the key. Each shard is
+    an LRU cache with its own lock and an equal share of `maxsize`, so threads
+    looking up different keys rarely wait for each other. This matters when
+    Python runs without the GIL.
+
+    Args:
+        maxsize (int): Maximum number of entries.
+
+    Raises:
+        ValueError: `maxsize` is not positive.
+    """
+
+    def __init__(self, maxsize):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive: %r" % maxsize)
+        self._maxsize = maxsize
+        count = max(1, min(_MAX_SHARDS, maxsize // _SHARD_SIZE))
+        self._shards = [
+            _Shard(maxsize // count + (i < maxsize % count)) for i in range(count)
+        ]
+
+    @property
+    def maxsize(self):
+        """Maximum number of entries."""
+        return self._maxsize
+
+    def __len__(self):
+        """Return number of entries in the cache."""
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def _shard(self, key):
+        """Return the shard for `key`."""
+        shards = self._shards
+        if len(shards) == 1:
+            return shards[0]
+        return shards[hash(key) % len(shards)]
+
+    def get(self, key):
+        """Look up the entry for `key` and mark it as recently used.
+
+        Args:
+            key (str): Input value.
+
+        Returns:
+            Optional[CheckResult]: Cached result or None if not found.
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
+            else:
+                shard.hits += 1
+                shard.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        """Add an entry, evicting the least recently used one if full.
+
+        Args:
+            key (str): Input value.
+            entry (CheckResult): Result to cache.
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            shard.entries[key] = entry
+            shard.entries.move_to_end(key)
+            if len(shard.entries) > shard.maxsize:
+                shard.entries.popitem(last=False)
+                shard.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.hits = 0
+                shard.misses = 0
+                shard.evictions = 0
+
+    def info(self):
+        """Return cache statistics.
+
+        The shards are read one at a time, so the totals may be inconsistent
+        while other threads are using the cache.
+
+        Returns:
+            CacheInfo: Named tuple (hits, misses, evictions, maxsize, currsize).
+        """
+        hits = misses = evictions = currsize = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                evictions += shard.evictions
+                currsize += len(shard.entries)
+        return CacheInfo(hits, misses, evictions, self._maxsize, currsize)
+
+
+class _Shard:
+    """One LRU shard of an `EnforcementCache`."""
+
+    __slots__ = ("maxsize", "entries", "lock", "hits", "misses", "evictions")
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
@@ -0,0 +1,20 @@
+from typing import NamedTuple, Optional
+
+from precis_i18n.baseclass import CheckResult
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+class EnforcementCache:
+    def __init__(self, maxsize: int) -> None: ...
+    @property
+    def maxsize(self) -> int: ...
+    def __len__(self) -> int: ...
+    def get(self, key: str) -> Optional[CheckResult]: ...
+    def put(self, key: str, entry: CheckResult) -> None: ...
+    def clear(self) -> None: ...
+    def info(self) -> CacheInfo: ...
@@ -1,24 +1,262 @@
 """Registers precis_i18n codec."""
 
 import codecs
+import contextlib
+import threading
+import warnings
 
-from precis_i18n import get_profile
+import precis_i18n
 
 
 def _make_encode(profile):
     def _encode(input, errors="strict"):
-        if errors != "strict":
-            raise ValueError("invalid errors argument")
-        return (profile.enforce(input).encode("utf-8"), len(input))
+        return (_encode_value(profile, profile.enforce, input, errors), len(input))
 
     return _encode
 
 
+def _encode_value(profile, enforce, value, errors):
+    """Enforce `value` and return it encoded as UTF-8.
+
+    If `errors` is not 'strict', violations are passed to the registered error
+    handler. Violations of a single character are handled individually. A
+    violation that applies to the entire string (such as the BiDi Rule) is
+    handled once, for the entire string.
+
+    Args:
+        profile (Union[Profile, BaseClass]): PRECIS profile.
+        enforce (Callable[[str], str]): Enforcement function for `profile`.
+        value (str): Value to enforce.
+        errors (str): Name of error handler.
+
+    Returns:
+        bytes: Enforced value encoded as UTF-8.
+
+    Raises:
+        UnicodeEncodeError: Value is disallowed and error handler raised.
+        LookupError: Unknown error handler.
+    """
+    if errors == "strict":
+        return enforce(value).encode("utf-8")
+    # pylint: disable=import-outside-toplevel
+    from precis_i18n.baseclass import make_error
+
+    handler = codecs.lookup_error(errors)
+    try:
+        return enforce(value).encode("utf-8")
+    except UnicodeEncodeError:
+        pass
+
+    temp, violations = profile.enforce_report(value)
+    for offset, kind in violations:
+        if offset < 0:
+            violations = [(offset, kind)]
+            break
+
+    result = []
+    pos = 0
+    for offset, kind in violations:
+        if 0 <= offset < pos:
+            # Already skipped by the error handler.
+            continue
+        exc = make_error(profile.name, temp, offset, kind)
+        result.append(temp[pos : exc.start].encode("utf-8"))
+        replacement, pos = handler(exc)
+        if pos < 0:
+            pos += len(temp)
+        if isinstance(replacement, str):
+            replacement = replacement.encode("utf-8")
+        result.append(replacement)
+    result.append(temp[pos:].encode("utf-8"))
+    return b"".join(result)
+
+
 def _not_supported(input, errors="strict"):
     # pylint: disable=unused-argument
     raise NotImplementedError("decode not supported")
 
 
+# Per-thread stack of lists collecting errors for the 'precis_report' handler.
+_COLLECTORS = threading.local()
+
+
+@contextlib.contextmanager
+def collect_errors():
+    """Collect the errors handled by the 'precis_report' error handler.
+
+    The 'precis_report' error handler removes disallowed characters, like
+    'ignore', and appends each error to the list yielded by the innermost
+    `collect_errors` context of the current thread. Outside of a
+    `collect_errors` context, the handler raises the error.
+
+    Yields:
+        List[UnicodeEncodeError]: Errors handled by 'precis_report'.
+    """
+    stack = getattr(_COLLECTORS, "stack", None)
+    if stack is None:
+        stack = _COLLECTORS.stack = []
+    errors = []
+    stack.append(errors)
+    try:
+        yield errors
+    finally:
+        stack.pop()
+
+
+def _report_error(exc):
+    """Error handler that records `exc` in the current `collect_errors` list."""
+    stack = getattr(_COLLECTORS, "stack", None)
+    if not stack or not isinstance(exc, UnicodeEncodeError):
+        raise exc
+    stack[-1].append(exc)
+    return ("", exc.end)
+
+
+class IncrementalEncoder(codecs.IncrementalEncoder):
+    """Incremental encoder that enforces a profile on each line.
+
+    Each line is enforced as a separate value; its line terminator ('\\n' or
+    '\\r\\n') is passed through unchanged. A partial line is buffered until
+    the rest of the line arrives, or until `encode` is called with `final`
+    set to true.
+
+    `io.TextIOWrapper` never calls `encode` with `final` set to true, so a
+    file opened with `open(..., encoding=...)` or `codecs.open` must end
+    with a line terminator. If the encoder is discarded while a partial line
+    is buffered, a `RuntimeWarning` is issued.
+
+    Subclasses set `_profile` to the profile, and `_enforce` to its
+    enforcement function.
+
+    Args:
+        errors (str): Error handling scheme.
+    """
+
+    _profile = None
+    _enforce = None
+
+    def __init__(self, errors="strict"):
+        super().__init__(errors)
+        self._pending = ""
+
+    def __del__(self):
+        if self._pending:
+            warnings.warn(
+                "%s: unterminated line discarded: %r"
+                % (getattr(self._profile, "name", None), self._pending),
+                RuntimeWarning,
+            )
+
+    def encode(self, input, final=False):
+        """Enforce each complete line in `input` and return UTF-8 bytes.
+
+        Args:
+            input (str): Next chunk of text.
+            final (bool): True if this is the last chunk.
+
+        Returns:
+            bytes: Enforced lines encoded as UTF-8.
+
+        Raises:
+            UnicodeEncodeError: A line is disallowed by the profile.
+        """
+        lines = (self._pending + input).split("\n")
+        self._pending = lines.pop()
+        if final and self._pending:
+            lines.append(self._pending)
+            self._pending = ""
+            terminated = len(lines) - 1
+        else:
+            terminated = len(lines)
+
+        profile = self._profile
+        enforce = self._enforce
+        errors = self.errors
+        result = []
+        for i, line in enumerate(lines):
+            if i == terminated:
+                result.append(_encode_value(profile, enforce, line, errors))
+            elif line.endswith("\r"):
+                result.append(_encode_value(profile, enforce, line[:-1], errors))
+                result.append(b"\r\n")
+            else:
+                result.append(_encode_value(profile, enforce, line, errors))
+                result.append(b"\n")
+        return b"".join(result)
+
+    def reset(self):
+        """Discard any buffered partial line."""
+        self._pending = ""
+
+
+class StreamWriter(codecs.StreamWriter):
+    """Stream writer that enforces a profile on each line.
+
+    A partial line is buffered until the rest of the line is written. `flush`,
+    `reset` and `close` write a buffered partial line as the final line, and
+    so does leaving the writer's context.
+
+    `codecs.open` closes the file directly, without calling the stream
+    writer, so a file opened with `codecs.open` must end with a line
+    terminator. Use `codecs.getwriter` to wrap the file instead.
+
+    Subclasses set `incrementalencoder` to the incremental encoder class for
+    a profile.
+
+    Args:
+        stream (BinaryIO): Output stream.
+        errors (str): Error handling scheme.
+    """
+
+    incrementalencoder = IncrementalEncoder
+
+    def __init__(self, stream, errors="strict"):
+        super().__init__(stream, errors)
+        self._encoder = self.incrementalencoder(errors)
+
+    def write(self, object):
+        """Write the enforced, complete lines in `object` to the stream.
+
+        Args:
+            object (str): Next chunk of text.
+        """
+        # pylint: disable=redefined-builtin
+        self.stream.write(self._encoder.encode(object))
+
+    def reset(self):
+        """Write any buffered partial line to the stream."""
+        data = self._encoder.encode("", final=True)
+        if data:
+            self.stream.write(data)
+
+    def flush(self):
+        """Write any buffered partial line, then flush the stream."""
+        self.reset()
+        self.stream.flush()
+
+    def close(self):
+        """Write any buffered partial line, then close the stream."""
+        try:
+            self.reset()
+        finally:
+            self.stream.close()
+
+    def __exit__(self, type, value, tb):
+        # pylint: disable=redefined-builtin
+        if type is None:
+            self.close()
+        else:
+            self._encoder.reset()
+            self.stream.close()
+
+
+class StreamReader(codecs.StreamReader):
+    """Stream reader for PRECIS codecs. Decoding is not supported."""
+
+    def decode(self, input, errors="strict"):
+        return _not_supported(input, errors)
+
+
 def search(name):
     """Search function registered for PRECIS codecs.
 
@@ -29,13 +267,30 @@ def search(name):
         CodecInfo: Encode/decode information or None if not found.
     """
     try:
-        profile = get_profile(name)
+        profile = precis_i18n.get_profile(name)
     except KeyError:
         return None
 
+    # Use the compiled profile for streams. Base string classes don't have
+    # a `compile` method.
+    compile_profile = getattr(profile, "compile", None)
+    enforce = compile_profile() if compile_profile else profile.enforce
+    encoder = type(
+        "IncrementalEncoder",
+        (IncrementalEncoder,),
+        {"_profile": profile, "_enforce": staticmethod(enforce)},
+    )
+    writer = type("StreamWriter", (StreamWriter,), {"incrementalencoder": encoder})
+
     return codecs.CodecInfo(
-        name=name, encode=_make_encode(profile), decode=_not_supported
+        name=name,
+        encode=_make_encode(profile),
+        decode=_not_supported,
+        incrementalencoder=encoder,
+        streamwriter=writer,
+        streamreader=StreamReader,
     )
 
 
 codecs.register(search)
+codecs.register_error("precis_report", _report_error)
@@ -1,4 +1,45 @@
+import codecs
 from codecs import CodecInfo
-from typing import Optional
+from types import TracebackType
+from typing import (
+    BinaryIO,
+    Callable,
+    ClassVar,
+    ContextManager,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from precis_i18n.baseclass import BaseClass
+from precis_i18n.profile import Profile
+
+def collect_errors() -> ContextManager[List[UnicodeEncodeError]]: ...
+
+class IncrementalEncoder(codecs.IncrementalEncoder):
+    _profile: ClassVar[Optional[Union[BaseClass, Profile]]]
+    _enforce: ClassVar[Optional[Callable[[str], str]]]
+    def __init__(self, errors: str = ...) -> None: ...
+    def encode(self, input: str, final: bool = ...) -> bytes: ...
+    def reset(self) -> None: ...
+
+class StreamWriter(codecs.StreamWriter):
+    incrementalencoder: ClassVar[Type[IncrementalEncoder]]
+    def __init__(self, stream: BinaryIO, errors: str = ...) -> None: ...
+    def write(self, object: str) -> None: ...
+    def reset(self) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+    def __exit__(
+        self,
+        type: Optional[Type[BaseException]],
+        value: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None: ...
+
+class StreamReader(codecs.StreamReader):
+    def decode(self, input: bytes, errors: str = ...) -> Tuple[str, int]: ...
 
 def search(name: str) -> Optional[CodecInfo]: ...
@@ -29,13 +29,32 @@ class CodepointSet:
     Note: Sets with any non-BMP codepoints will use 32-bits for all codepoints.
     (PEP 393 Flexible String Representation)
 
+    The multi-line string is parsed when the set is first used, so defining a
+    table at module level doesn't add to import time.
+
     Args:
         table (str): Multi-line string of code point ranges.
     """
 
     def __init__(self, table):
-        self._table = _stringify(_coalesce(_parse(table)))
-        assert (len(self._table) % 2) == 0
+        self._source = table
+        self._table = None
+
+    def _ranges(self):
+        """Return the string of ranges, parsing the table on first use.
+
+        Returns:
+            str: String with lo..hi ranges concatenated.
+
+        Raises:
+            ValueError: Error while parsing the table.
+        """
+        table = self._table
+        if table is None:
+            table = _stringify(_coalesce(_parse(self._source)))
+            assert (len(table) % 2) == 0
+            self._table = table
+        return table
 
     def __contains__(self, cp):
         """Check if code point `cp` is in the set.
@@ -48,11 +67,14 @@ class CodepointSet:
         """
         if not 0 <= cp <= 0x10FFFF:
             return False
+        table = self._table
+        if table is None:
+            table = self._ranges()
         char = chr(cp)
-        idx = bisect_left(self._table, char)
-        if idx >= len(self._table):
+        idx = bisect_left(table, char)
+        if idx >= len(table):
             return False
-        return (idx % 2) == 1 or self._table[idx] == char
+        return (idx % 2) == 1 or table[idx] == char
 
     def __len__(self):
         """Return size of set.
@@ -79,7 +101,7 @@ class CodepointSet:
         # pylint: disable=protected-access
         if self.__class__ != rhs.__class__:
             return False
-        return self._table == rhs._table
+        return self._ranges() == rhs._ranges()
 
     def __repr__(self):
         """Return string representation of set.
@@ -92,12 +114,44 @@ class CodepointSet:
 
     def items(self):
         """Generator yielding sequence of range tuples (lo, hi)."""
-        for i in range(len(self._table) // 2):
-            lo = ord(self._table[2 * i])
-            hi = ord(self._table[2 * i + 1])
+        table = self._ranges()
+        for i in range(len(table) // 2):
+            lo = ord(table[2 * i])
+            hi = ord(table[2 * i + 1])
             yield (lo, hi)
 
 
+def char_class(cps):
+    """Return compiled regex matching any of the code points in `cps`.
+
+    Consecutive code points are coalesced into ranges. If `cps` is empty, the
+    regex never matches.
+
+    Args:
+        cps (Iterable[int]): Code points.
+
+    Returns:
+        Pattern: Compiled regular expression.
+    """
+    ranges = []
+    for cp in sorted(set(cps)):
+        if ranges and ranges[-1][1] + 1 == cp:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    if not ranges:
+        return re.compile(r"(?!)")
+    elems = "".join(
+        (
+            re.escape(chr(lo))
+            if lo == hi
+            else "%s-%s" % (re.escape(chr(lo)), re.escape(chr(hi)))
+        )
+        for lo, hi in ranges
+    )
+    return re.compile("[%s]" % elems)
+
+
 def _parse(table):
     """Parse a multi-line string containing codepoint ranges.
 
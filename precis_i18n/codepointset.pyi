@@ -1,9 +1,15 @@
-from typing import Generator, Tuple
+from typing import Generator, Iterable, Optional, Pattern, Tuple
 
 class CodepointSet:
+    _source: str
+    _table: Optional[str]
+
     def __init__(self, table: str) -> None: ...
+    def _ranges(self) -> str: ...
     def __contains__(self, cp: int) -> bool: ...
     def __len__(self) -> int: ...
     def __eq__(self, rhs: object) -> bool: ...
     def __repr__(self) -> str: ...
     def items(self) -> Generator[Tuple[int, int], None, None]: ...
+
+def char_class(cps: Iterable[int]) -> Pattern[str]: ...
@@ -0,0 +1,59 @@
+"""Implements the CompiledProfile class."""
+
+
+class CompiledProfile:
+    """Callable that enforces a PRECIS profile.
+
+    Use `Profile.compile` to create a compiled profile. Calling it is
+    equivalent to calling `Profile.enforce`, except that the enforcement cache
+    is not used.
+
+    A compiled profile is pickled by pickling its profile. Unpickling it
+    compiles the unpickled profile again.
+
+    Args:
+        profile (Profile): Profile that was compiled.
+        enforce (Callable[[Union[str, bytes]], str]): Enforcement function.
+    """
+
+    __slots__ = ("_profile", "_enforce")
+
+    def __init__(self, profile, enforce):
+        self._profile = profile
+        self._enforce = enforce
+
+    @property
+    def name(self):
+        """Profile name."""
+        return self._profile.name
+
+    def __call__(self, value):
+        """Enforce the profile on `value`.
+
+        Args:
+            value (Union[str, bytes]): String value to enforce.
+
+        Returns:
+            str: Enforced value.
+
+        Raises:
+            UnicodeEncodeError: Value is disallowed by the profile.
+            ValueError: `value` not a string or bytes.
+        """
+        return self._enforce(value)
+
+    def __reduce__(self):
+        """Pickle the profile, so it's compiled again when unpickled.
+
+        Raises:
+            TypeError: The profile can't be pickled.
+        """
+        return (_compile, (self._profile,))
+
+    def __repr__(self):
+        return "CompiledProfile(%r)" % self.name
+
+
+def _compile(profile):
+    """Return compiled profile for `profile`. Used by pickle."""
+    return profile.compile()
@@ -0,0 +1,12 @@
+from typing import Any, Callable, Tuple, Union
+
+from precis_i18n.profile import Profile
+
+class CompiledProfile:
+    def __init__(
+        self, profile: Profile, enforce: Callable[[Union[bytes, str]], str]
+    ) -> None: ...
+    @property
+    def name(self) -> str: ...
+    def __call__(self, value: Union[bytes, str]) -> str: ...
+    def __reduce__(self) -> Tuple[Any, ...]: ...
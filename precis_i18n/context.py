@@ -1,13 +1,19 @@
 """Implements PRECIS rules for derived properties CONTEXTJ and CONTEXTO."""
 
 
-def context_rule_error(value, offset, ucd):
+def context_rule_error(value, offset, ucd, memo=None):
     """Apply the PRECIS context rules to `value[offset]`.
 
+    Some rules test the entire string, irrespective of `offset`. To test the
+    string only once per rule, pass the same `memo` dictionary for each offset
+    in `value`.
+
     Args:
         value (str): String value to check.
         offset (int): Position within `value`.
         ucd (UnicodeData): Unicode character database.
+        memo (Optional[dict]): Results of the rules that test the entire
+            string, keyed by rule.
 
     Returns:
         str: '' if no error, or name of the rule that failed.
@@ -20,11 +26,12 @@ def context_rule_error(value, offset, ucd):
     else:
         rule = _RULES[cp]
 
-    try:
-        valid = rule(value, offset, ucd)
-    except IndexError:
-        # Handle failure of _before and _after accessors.
-        valid = False
+    if memo is None or rule not in _STRING_RULES:
+        valid = _apply_rule(rule, value, offset, ucd)
+    else:
+        valid = memo.get(rule)
+        if valid is None:
+            valid = memo[rule] = _apply_rule(rule, value, offset, ucd)
 
     if valid:
         return ""
@@ -37,6 +44,15 @@ def context_rule_error(value, offset, ucd):
     return result
 
 
+def _apply_rule(rule, value, offset, ucd):
+    """Return result of context `rule` for `value[offset]`."""
+    try:
+        return rule(value, offset, ucd)
+    except IndexError:
+        # Handle failure of _before and _after accessors.
+        return False
+
+
 # These rules test a character at a given offset in the string.
 
 
@@ -226,6 +242,11 @@ _RULES = {
     0x30FB: rule_katakana_middle_dot,
 }
 
+# Rules that test the entire string.
+_STRING_RULES = frozenset(
+    [rule_katakana_middle_dot, rule_arabic_indic, rule_extended_arabic_indic]
+)
+
 
 def _before(value, offset):
     """Return code point before `value[offset]` or raise IndexError."""
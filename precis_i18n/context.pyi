@@ -1,6 +1,15 @@
+from typing import Callable, Dict, Optional
+
 from precis_i18n.unicode import UnicodeData
 
-def context_rule_error(value: str, offset: int, ucd: UnicodeData) -> str: ...
+_Rule = Callable[[str, int, UnicodeData], bool]
+
+def context_rule_error(
+    value: str,
+    offset: int,
+    ucd: UnicodeData,
+    memo: Optional[Dict[_Rule, bool]] = ...,
+) -> str: ...
 def rule_zero_width_nonjoiner(value: str, offset: int, ucd: UnicodeData) -> bool: ...
 def rule_zero_width_joiner(value: str, offset: int, ucd: UnicodeData) -> bool: ...
 def rule_middle_dot(value: str, offset: int, ucd: UnicodeData) -> bool: ...
@@ -11,3 +20,4 @@ def rule_arabic_indic(value: str, offset: int, ucd: UnicodeData) -> bool: ...
 def rule_extended_arabic_indic(value: str, offset: int, ucd: UnicodeData) -> bool: ...
 
 _RULES = ...
+_STRING_RULES = ...
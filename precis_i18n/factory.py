@@ -3,6 +3,7 @@
 import precis_i18n.baseclass as _base
 import precis_i18n.profile as _profile
 import precis_i18n.unicode as _unicode
+from precis_i18n.warmup import measure
 
 
 def _factory(profile, **kwds):
@@ -41,7 +42,43 @@ _PROFILES = {
 }
 
 
-def get_profile(name, *, unicodedata=None):
+# Shared profile objects, keyed by (profile, unicodedata).
+_CACHE = {}
+
+
+def _profile_key(name):
+    return name.lower().replace(":", "_")
+
+
+def register_profile(name, factory):
+    """Register a custom profile with `get_profile` and the PRECIS codecs.
+
+    `factory` is called with a `UnicodeData` object and returns a new profile
+    object. It is called once per unicodedata interface; the profile object
+    is cached and shared like the built-in profiles. Register the profile
+    before its codec name is first looked up.
+
+    A `Profile` subclass that doesn't override any of the mapping rules uses
+    the same fast tables as the built-in profiles. For example:
+
+        register_profile(
+            "ShortUsername",
+            lambda ucd: ShortUsername(ucd, "ShortUsername", casemap="lower"),
+        )
+
+    Args:
+        name (str): name of the profile; case-insensitive.
+        factory (Callable[[UnicodeData], AbstractProfile]): Profile factory.
+
+    Raises:
+        ValueError: A profile with the same name is already registered.
+    """
+    profile = _profile_key(name)
+    if _PROFILES.setdefault(profile, factory) is not factory:
+        raise ValueError("Profile already registered: %r" % name)
+
+
+def get_profile(name, *, unicodedata=None, cached=True):
     """Return the desired PRECIS profile object.
 
     Choose name from:
@@ -58,7 +95,13 @@ def get_profile(name, *, unicodedata=None):
         "NicknameCaseMapped:ToLower"
         "Nickname" (alias for "NicknameCaseMapped")
 
-    This function constructs a new profile each time; there is no cache.
+    or the name of a profile added by `register_profile`.
+
+    Profile objects are cached and shared, keyed by the profile and the
+    identity of the unicodedata interface. Shared profiles are immutable; use
+    `with_cache` to get a private copy with an enforcement cache. Pass
+    `cached=False` to construct a new, private profile object. Use `get_profile.cache_clear()`
+    to discard all shared profiles.
 
     To use an alternative Unicode implementation, pass a module or object that
     implements the unicodedata interface via the unicodedata keyword argument.
@@ -67,6 +110,7 @@ def get_profile(name, *, unicodedata=None):
     Args:
         name (str): name of a PRECIS profile
         unicodedata (module|object): Alternative unicodedata interface
+        cached (bool): If false, always construct a new profile object.
 
     Returns:
         AbstractProfile: PRECIS profile object.
@@ -74,5 +118,66 @@ def get_profile(name, *, unicodedata=None):
     Raises:
         KeyError: Profile not found.
     """
-    profile = name.lower().replace(":", "_")
-    return _PROFILES[profile](_unicode.UnicodeData(unicodedata))
+    profile = _profile_key(name)
+    factory = _PROFILES[profile]
+    if not cached:
+        return factory(_unicode.get_unicode_data(unicodedata))
+
+    key = (profile, unicodedata)
+    try:
+        return _CACHE[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable unicodedata interface can't be cached.
+        return factory(_unicode.UnicodeData(unicodedata))
+    shared = factory(_unicode.get_unicode_data(unicodedata))
+    if isinstance(shared, _profile.Profile):
+        shared._shared = True  # pylint: disable=protected-access
+    # If another thread constructed the profile first, return that one.
+    return _CACHE.setdefault(key, shared)
+
+
+def _cache_clear():
+    """Discard all shared profile objects."""
+    _CACHE.clear()
+
+
+get_profile.cache_clear = _cache_clear
+
+
+def warm_up(profiles=None, scripts=None, *, unicodedata=None, trace_memory=False):
+    """Build the tables of the shared profile objects ahead of time.
+
+    Call `warm_up` before serving requests, for example in the parent process
+    before forking workers. The shared profile objects returned by
+    `get_profile` are constructed and warmed; see `Profile.warm`.
+
+    Args:
+        profiles (Optional[Iterable[str]]): Profile names. The default is all
+            profiles, including registered profiles.
+        scripts (Optional[Iterable[str]]): Script names whose context rule
+            tables are built. The default is all scripts.
+        unicodedata (module|object): Alternative unicodedata interface
+        trace_memory (bool): Measure memory using `tracemalloc`, which makes
+            warming about ten times slower.
+
+    Returns:
+        WarmUpReport: Named tuple (seconds, memory) for all profiles.
+
+    Raises:
+        KeyError: Profile not found.
+        ValueError: Unknown script name.
+    """
+    if profiles is None:
+        profiles = list(_PROFILES)
+    if scripts is not None:
+        scripts = list(scripts)
+
+    def _warm_up():
+        for name in profiles:
+            get_profile(name, unicodedata=unicodedata).warm(
+                scripts, trace_memory=trace_memory
+            )
+
+    return measure(_warm_up, trace_memory=trace_memory)
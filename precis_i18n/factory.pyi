@@ -1,9 +1,30 @@
-from typing import Dict, Union
+from typing import Any, Callable, Dict, Iterable, Optional, Protocol, Tuple, Union
 
 from precis_i18n.baseclass import BaseClass
 from precis_i18n.profile import Profile
 from precis_i18n.unicode import UnicodeData
+from precis_i18n.warmup import WarmUpReport
 
 _PROFILES = Dict[str, Union[BaseClass, Profile]]
 
-def get_profile(name: str, *, unicodedata: UnicodeData = ...) -> Profile: ...
+_CACHE = Dict[Tuple[str, Any], Union[BaseClass, Profile]]
+
+def register_profile(
+    name: str, factory: Callable[[UnicodeData], Union[BaseClass, Profile]]
+) -> None: ...
+
+class _GetProfile(Protocol):
+    def __call__(
+        self, name: str, *, unicodedata: UnicodeData = ..., cached: bool = ...
+    ) -> Profile: ...
+    def cache_clear(self) -> None: ...
+
+get_profile: _GetProfile
+
+def warm_up(
+    profiles: Optional[Iterable[str]] = ...,
+    scripts: Optional[Iterable[str]] = ...,
+    *,
+    unicodedata: Any = ...,
+    trace_memory: bool = ...
+) -> WarmUpReport: ...
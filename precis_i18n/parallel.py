@@ -0,0 +1,109 @@
+"""Implements bulk enforcement using a pool of worker processes."""
+
+import concurrent.futures
+import itertools
+import os
+
+from precis_i18n.factory import get_profile
+from precis_i18n.shared import attach_tables, publish_tables, shared_memory
+
+
+def enforce_parallel(
+    profile_name, iterable, workers=None, chunksize=1000, *, unicodedata=None
+):
+    """Enforce a PRECIS profile on each value in `iterable` using processes.
+
+    The values are split into chunks of `chunksize` values. Each chunk is
+    enforced by `Profile.enforce_many` in a worker process. The profile is
+    pickled by name, so each worker uses its own shared profile object from
+    `get_profile`; a registered profile must also be registered in the
+    workers. On platforms that start workers with 'spawn', call this function
+    from under an `if __name__ == "__main__":` guard.
+
+    Where `multiprocessing.shared_memory` is available, the profile's tables
+    are built once in the calling process and published to the workers with
+    `publish_tables`, instead of being built again in each worker.
+
+    Returns two lists parallel to `iterable`, in the same order. For each
+    accepted value, `results[i]` is the enforced string and `errors[i]` is
+    None. For each rejected value, `results[i]` is None and `errors[i]` is
+    the exception that `enforce` would have raised.
+
+    Args:
+        profile_name (str): Name of a PRECIS profile.
+        iterable (Iterable[Union[str, bytes]]): String values to enforce.
+        workers (Optional[int]): Number of worker processes. The default is
+            the number of CPUs. If 1, the values are enforced in the calling
+            process.
+        chunksize (int): Number of values sent to a worker at a time.
+        unicodedata (module): Alternative unicodedata module.
+
+    Returns:
+        Tuple[List[Optional[str]], List[Optional[ValueError]]]: Results and
+            errors.
+
+    Raises:
+        KeyError: Profile not found.
+        ValueError: `workers` or `chunksize` is less than 1.
+        TypeError: `unicodedata` is not an importable module.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError("workers and chunksize must be at least 1")
+
+    profile = get_profile(profile_name, unicodedata=unicodedata)
+    if workers == 1:
+        return _enforce_chunk(profile, iterable)
+
+    tables = None
+    options = {}
+    if shared_memory is not None:
+        tables = publish_tables([profile_name], unicodedata=unicodedata)
+        options = {"initializer": attach_tables, "initargs": (tables.name,)}
+
+    results = []
+    errors = []
+    try:
+        with concurrent.futures.ProcessPoolExecutor(workers, **options) as executor:
+            chunks = _chunks(iterable, chunksize)
+            for chunk_results, chunk_errors in executor.map(
+                _enforce_chunk, itertools.repeat(profile), chunks
+            ):
+                results.extend(chunk_results)
+                errors.extend(chunk_errors)
+    finally:
+        if tables is not None:
+            tables.unlink()
+    return results, errors
+
+
+def _chunks(iterable, size):
+    """Generate lists of up to `size` values from `iterable`."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _enforce_chunk(profile, values):
+    """Enforce `profile` on each value. Runs in a worker process.
+
+    String classes don't have `enforce_many`; their values are enforced one
+    at a time.
+    """
+    enforce_many = getattr(profile, "enforce_many", None)
+    if enforce_many is not None:
+        return enforce_many(values)
+    results = []
+    errors = []
+    for value in values:
+        try:
+            results.append(profile.enforce(value))
+            errors.append(None)
+        except ValueError as ex:
+            results.append(None)
+            errors.append(ex)
+    return results, errors
@@ -0,0 +1,10 @@
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+def enforce_parallel(
+    profile_name: str,
+    iterable: Iterable[Union[bytes, str]],
+    workers: Optional[int] = ...,
+    chunksize: int = ...,
+    *,
+    unicodedata: Any = ...
+) -> Tuple[List[Optional[str]], List[Optional[ValueError]]]: ...
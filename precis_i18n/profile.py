@@ -1,9 +1,23 @@
 """Implements the PRECIS profile classes."""
 
+import hashlib
 import re
 
-from precis_i18n.baseclass import FreeFormClass, IdentifierClass, raise_error
+from precis_i18n.baseclass import (
+    CheckResult,
+    FreeFormClass,
+    IdentifierClass,
+    Report,
+    error_kind,
+    make_error,
+    raise_error,
+)
 from precis_i18n.bidi import bidi_rule, has_rtl
+from precis_i18n.cache import EnforcementCache
+from precis_i18n.codepointset import char_class
+from precis_i18n.compiled import CompiledProfile
+from precis_i18n.unicode import import_backend
+from precis_i18n.warmup import measure
 
 # pylint: disable=no-self-use
 
@@ -11,7 +25,9 @@ from precis_i18n.bidi import bidi_rule, has_rtl
 class Profile:
     """Base class for a PRECIS profile.
 
-    Subclasses should override the `*_rule` methods.
+    Subclasses should override the `*_rule` methods. A subclass that
+    overrides `enforce` to add its own checks is used by the other
+    enforcement methods, such as `check` and `enforce_many`, as well.
 
     Args:
         base (BaseClass): Base string class.
@@ -31,6 +47,30 @@ class Profile:
             self._casemap = _caselower
         else:
             raise ValueError("Unknown casemap value: %s" % casemap)
+        # Profiles that override the five rules outside this module use the
+        # rule methods as written; they can't use the derived tables below.
+        self._custom = _has_custom_rules(type(self))
+        # Profiles that override `enforce` add their own checks. The other
+        # enforcement methods call `enforce` instead of the shared engine.
+        self._override = type(self).enforce is not Profile.enforce
+        # Built-in profiles with a directionality rule check it in the same
+        # pass over the string as the base string class.
+        self._bidi = not self._custom and (
+            type(self)._directionality_error is not Profile._directionality_error
+        )
+        # Tables derived from the mapping rules. Built on first use by
+        # `_build_tables`. Set to False if the profile has custom rules.
+        self._unstable = None
+        self._table = None
+        self._fallback = None
+        self._ascii = None
+        self._ascii_str = None
+        self._ascii_changed = None
+        self._ascii_table = None
+        self._cache = None
+        # True if the profile is shared by `get_profile`. The cache of a
+        # shared profile can't be changed.
+        self._shared = False
 
     @property
     def base(self):
@@ -42,6 +82,92 @@ class Profile:
         """Profile name."""
         return self._name
 
+    @property
+    def cache(self):
+        """Enforcement cache, or None if caching is disabled."""
+        return self._cache
+
+    def __reduce__(self):
+        """Pickle by profile name, unicodedata module and Unicode version.
+
+        Unpickling returns the shared profile object from `get_profile`, so
+        a registered profile must also be registered in the process that
+        loads it. The enforcement cache is not pickled.
+
+        Raises:
+            TypeError: The unicodedata interface is not an importable module,
+                or `get_profile` doesn't construct this profile by its name.
+        """
+        if not _is_named(self):
+            raise TypeError("cannot pickle unregistered profile %r" % self.name)
+        return (_load, (self.name,) + self.base.ucd.__reduce__()[1])
+
+    def __copy__(self):
+        """Return a new profile object that shares this profile's state.
+
+        The copy shares the tables and the enforcement cache. The copy is
+        never shared by `get_profile`.
+        """
+        clone = type(self).__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone._shared = False
+        return clone
+
+    def enable_cache(self, maxsize=4096):
+        """Cache the results of `enforce` in a bounded LRU cache.
+
+        Both accepted and rejected values are cached. The cache is keyed by
+        the input string and is safe to use from multiple threads. Calling
+        this method again replaces the cache with a new, empty one.
+
+        The profiles shared by `get_profile` are immutable; use `with_cache`
+        to get a private copy with a cache.
+
+        Args:
+            maxsize (int): Maximum number of cached values.
+
+        Returns:
+            EnforcementCache: The new cache.
+
+        Raises:
+            ValueError: The profile is shared by `get_profile`.
+        """
+        self._check_private()
+        self._cache = EnforcementCache(maxsize)
+        return self._cache
+
+    def disable_cache(self):
+        """Stop caching the results of `enforce` and discard the cache.
+
+        Raises:
+            ValueError: The profile is shared by `get_profile`.
+        """
+        self._check_private()
+        self._cache = None
+
+    def with_cache(self, maxsize=4096):
+        """Return a private copy of the profile with its own enforcement cache.
+
+        The copy shares the profile's tables. See `enable_cache`.
+
+        Args:
+            maxsize (int): Maximum number of cached values.
+
+        Returns:
+            Profile: New profile object.
+        """
+        clone = self.__copy__()
+        clone.enable_cache(maxsize)
+        return clone
+
+    def _check_private(self):
+        """Raise ValueError if the profile is shared by `get_profile`."""
+        if self._shared:
+            raise ValueError(
+                "Profile %r is shared; use with_cache() for a private copy"
+                % self.name
+            )
+
     def enforce(self, value):
         """Ensure that all characters in `value` are allowed by the profile.
 
@@ -57,18 +183,579 @@ class Profile:
             UnicodeEncodeError: Value is disallowed by the profile.
             ValueError: `value` not a string or bytes.
         """
-        # If we get called with a byte string, decode it first.
-        if isinstance(value, bytes):
-            value = value.decode("utf-8")
-        elif not isinstance(value, str):
-            raise ValueError("not a string")
-        temp = self.apply_five_rules(value)
-        temp = self.idempotence_check(temp)
+        result = self._check_cached(_decode(value))
+        if not result.ok:
+            raise_error(self.name, result.value, result.offset, result.kind)
+        return result.value
+
+    async def enforce_async(self, value, *, threshold=None, executor=None):
+        """Enforce `value` without stalling the asyncio event loop.
+
+        Values longer than `threshold` are enforced in `executor`. See
+        `precis_i18n.aio.enforce_async`.
+
+        Args:
+            value (Union[str, bytes]): String value to enforce.
+            threshold (Optional[int]): Maximum length enforced inline.
+            executor (Optional[Executor]): Executor for long values.
+
+        Returns:
+            str: Enforced value.
+
+        Raises:
+            UnicodeEncodeError: Value is disallowed by the profile.
+            ValueError: `value` not a string or bytes.
+        """
+        # pylint: disable=import-outside-toplevel
+        from precis_i18n.aio import enforce_async
+
+        return await enforce_async(self, value, threshold=threshold, executor=executor)
+
+    def check(self, value):
+        """Check `value` against the profile without raising an exception.
+
+        If `value` is bytes, it's first decoded as UTF-8 to a string.
+
+        Args:
+            value (Union[str, bytes]): String value to check.
+
+        Returns:
+            CheckResult: Named tuple (ok, value, kind, offset).
+
+        Raises:
+            ValueError: `value` not a string or bytes.
+        """
+        return self._check_value(_decode(value))
+
+    def is_valid(self, value):
+        """Return true if `value` is allowed by the profile.
+
+        If `value` is bytes, it's first decoded as UTF-8 to a string.
+
+        Args:
+            value (Union[str, bytes]): String value to check.
+
+        Returns:
+            bool: True if `enforce` would succeed.
+
+        Raises:
+            ValueError: `value` not a string or bytes.
+        """
+        return self._check_value(_decode(value)).ok
+
+    def compare(self, value1, value2):
+        """Return true if two values are equivalent under the profile.
+
+        Both values are enforced and the results compared code point by code
+        point (RFC 8265 Section 3.4, RFC 8266 Section 2.4). A value that the
+        profile disallows is never equal to anything, including itself.
+
+        Identical values are only enforced once, and pure ASCII values are
+        compared using the mapping table without applying the full rules. If
+        the enforcement cache is enabled, stored values are only enforced once
+        per process.
+
+        If a value is bytes, it's first decoded as UTF-8 to a string.
+
+        Args:
+            value1 (Union[str, bytes]): First string value.
+            value2 (Union[str, bytes]): Second string value.
+
+        Returns:
+            bool: True if both values are allowed and enforce to the same string.
+
+        Raises:
+            ValueError: A value is not a string or bytes.
+        """
+        value1 = _decode(value1)
+        value2 = _decode(value2)
+        if value1 == value2:
+            return self._check_value(value1).ok
+
+        if self._unstable is None:
+            self._build_tables()
+        if (
+            self._ascii_str
+            and not self._override
+            and self._ascii_str.fullmatch(value1)
+            and self._ascii_str.fullmatch(value2)
+        ):
+            return value1.translate(self._table) == value2.translate(self._table)
+
+        result1 = self._check_value(value1)
+        if not result1.ok:
+            return False
+        result2 = self._check_value(value2)
+        return result2.ok and result1.value == result2.value
+
+    def enforce_many(self, values):
+        """Enforce the profile on each value in `values` without raising.
+
+        Returns two lists parallel to `values`. For each accepted value,
+        `results[i]` is the enforced string and `errors[i]` is None. For each
+        rejected value, `results[i]` is None and `errors[i]` is the exception
+        that `enforce` would have raised.
+
+        Identical values are only enforced once per call; they share the same
+        result and exception object. The enforcement cache is not used.
+
+        Args:
+            values (Iterable[Union[str, bytes]]): String values to enforce.
+
+        Returns:
+            Tuple[List[Optional[str]], List[Optional[ValueError]]]: Results and
+                errors.
+        """
+        results = []
+        errors = []
+        add_result = results.append
+        add_error = errors.append
+        check = self._check_enforce if self._override else self._check
+        name = self.name
+        seen = {}
+        for value in values:
+            try:
+                result, error = seen[value]
+            except KeyError:
+                result = error = None
+                try:
+                    checked = check(_decode(value))
+                    if checked.ok:
+                        result = checked.value
+                    else:
+                        error = make_error(
+                            name, checked.value, checked.offset, checked.kind
+                        )
+                except ValueError as ex:
+                    # Not a string, or UnicodeDecodeError.
+                    error = ex
+                seen[value] = (result, error)
+            except TypeError:
+                # Value is unhashable, so it can't be a string.
+                result, error = None, ValueError("not a string")
+            add_result(result)
+            add_error(error)
+        return results, errors
+
+    def comparison_key(self, value):
+        """Return the key that identifies `value` under the profile.
+
+        The key is the enforced value. Two values are equivalent under the
+        profile if and only if their keys are equal, so the key is suitable for
+        a unique index.
+
+        Args:
+            value (Union[str, bytes]): String value.
+
+        Returns:
+            str: Comparison key.
+
+        Raises:
+            UnicodeEncodeError: Value is disallowed by the profile.
+            ValueError: `value` not a string or bytes.
+        """
+        return self.enforce(value)
+
+    def comparison_digest(self, value, digest_size=16):
+        """Return a fixed-width digest of the comparison key for `value`.
+
+        The digest is a BLAKE2b hash of the UTF-8 encoded comparison key,
+        tagged with the profile name and Unicode version, so digests computed
+        under different profiles or Unicode versions are independent.
+        Requires Python 3.6 or later, for `hashlib.blake2b`.
+
+        Args:
+            value (Union[str, bytes]): String value.
+            digest_size (int): Size of digest in bytes (1-64).
+
+        Returns:
+            bytes: Digest of comparison key.
+
+        Raises:
+            UnicodeEncodeError: Value is disallowed by the profile.
+            ValueError: `value` not a string or bytes, or bad `digest_size`.
+            NotImplementedError: `hashlib.blake2b` is not available.
+        """
+        hasher = self._digest_hasher(digest_size)
+        hasher.update(self.enforce(value).encode("utf-8"))
+        return hasher.digest()
+
+    def comparison_digests(self, values, digest_size=16):
+        """Return the digest of the comparison key for each value in `values`.
+
+        Like `enforce_many`, returns two lists parallel to `values`. For each
+        rejected value, `digests[i]` is None and `errors[i]` is the exception
+        that `enforce` would have raised.
+
+        Args:
+            values (Iterable[Union[str, bytes]]): String values.
+            digest_size (int): Size of digest in bytes (1-64).
+
+        Returns:
+            Tuple[List[Optional[bytes]], List[Optional[ValueError]]]: Digests
+                and errors.
+
+        Raises:
+            ValueError: Bad `digest_size`.
+            NotImplementedError: `hashlib.blake2b` is not available.
+        """
+        tagged = self._digest_hasher(digest_size)
+        results, errors = self.enforce_many(values)
+        digests = []
+        for result in results:
+            if result is None:
+                digests.append(None)
+            else:
+                hasher = tagged.copy()
+                hasher.update(result.encode("utf-8"))
+                digests.append(hasher.digest())
+        return digests, errors
+
+    def _digest_hasher(self, digest_size):
+        """Return BLAKE2b hash object that has consumed the profile's tag.
+
+        Args:
+            digest_size (int): Size of digest in bytes.
+
+        Returns:
+            hashlib.blake2b: Hash object.
+
+        Raises:
+            NotImplementedError: `hashlib.blake2b` is not available.
+        """
+        blake2b = getattr(hashlib, "blake2b", None)
+        if blake2b is None:
+            raise NotImplementedError("comparison digests require Python 3.6+")
+        tag = "precis_i18n\0%s\0%s\0" % (self.name, self.base.ucd.version)
+        return blake2b(tag.encode("utf-8"), digest_size=digest_size)
+
+    def enforce_report(self, value):
+        """Report every violation of the profile in `value`.
+
+        Unlike `enforce`, this method does not stop at the first disallowed
+        character. It returns all disallowed characters, plus any failure of
+        the directionality rule, the idempotence check or the empty check.
+
+        If `value` is bytes, it's first decoded as UTF-8 to a string.
+
+        Args:
+            value (Union[str, bytes]): String value to check.
+
+        Returns:
+            Report: Named tuple (value, errors). Offsets refer to `value` after
+                the five rules are applied.
+
+        Raises:
+            ValueError: `value` not a string or bytes.
+        """
+        value = _decode(value)
+        errors = []
+        temp, kind = self._apply_rules(value)
+        if kind:
+            errors.append((-1, kind))
+        elif temp != value and not self._is_stable(temp):
+            try:
+                temp = self.idempotence_check(temp)
+            except UnicodeEncodeError as ex:
+                errors.append((-1, error_kind(ex)))
+        if not temp:
+            errors.append((-1, "empty"))
+        errors.extend(self.base.enforce_report(temp).errors)
+        if not errors and self._override:
+            result = self._check_enforce(value)
+            if not result.ok:
+                return Report(result.value, [(result.offset, result.kind)])
+        return Report(temp, errors)
+
+    def enforce_bytes(self, buf):
+        """Enforce the profile on a UTF-8 encoded buffer.
+
+        `buf` may be any object that supports the buffer protocol, such as
+        bytes, bytearray or memoryview. The result is UTF-8 encoded.
+
+        Pure ASCII buffers are validated and mapped without decoding them to
+        a string. If `buf` is bytes and enforcement doesn't change it, `buf`
+        itself is returned.
+
+        Args:
+            buf (bytes-like): UTF-8 encoded value to enforce.
+
+        Returns:
+            bytes: Enforced value encoded as UTF-8.
+
+        Raises:
+            UnicodeEncodeError: Value is disallowed by the profile.
+            UnicodeDecodeError: `buf` is not valid UTF-8.
+            ValueError: `buf` not a bytes-like object.
+        """
+        try:
+            data = memoryview(buf)
+        except TypeError:
+            raise ValueError("not a bytes-like object") from None
+        if not data.contiguous:
+            data = memoryview(data.tobytes())
+        if data.ndim != 1 or data.itemsize != 1:
+            data = data.cast("B")
+
+        if self._unstable is None:
+            self._build_tables()
+        if self._ascii and not self._override and self._ascii.fullmatch(data):
+            if self._ascii_changed.search(data):
+                return bytes(data).translate(self._ascii_table)
+            if type(buf) is bytes:  # pylint: disable=unidiomatic-typecheck
+                return buf
+            return bytes(data)
+
+        return self.enforce(str(data, "utf-8")).encode("utf-8")
+
+    def warm(self, scripts=None, *, trace_memory=False):
+        """Build the tables that are otherwise built on first use.
+
+        Call `warm` before serving requests, for example in the parent
+        process before forking workers, so that the first request doesn't
+        pay for building the mapping tables and the code point tables used
+        by the context rules.
+
+        Args:
+            scripts (Optional[Iterable[str]]): Script names whose context rule
+                tables are built. The default is all scripts.
+            trace_memory (bool): Measure memory using `tracemalloc`, which
+                makes warming about ten times slower.
+
+        Returns:
+            WarmUpReport: Named tuple (seconds, memory).
+
+        Raises:
+            ValueError: Unknown script name.
+        """
+        return measure(self._warm, scripts, trace_memory=trace_memory)
+
+    def _warm(self, scripts):
+        """Build the mapping tables and the code point tables for `warm`."""
+        if self._unstable is None:
+            self._build_tables()
+        self.base.ucd.warm(scripts)
+
+    def compile(self):
+        """Return a callable specialized to enforce this profile.
+
+        The callable only contains the stages the profile needs. The mapping
+        stages that don't change any code point for the profile are skipped,
+        as is the directionality rule for profiles without one, and the
+        mapping tables are bound as local variables. Profiles that override
+        the five rules or `enforce` are compiled to `enforce`.
+
+        Returns:
+            CompiledProfile: Callable equivalent to `enforce`.
+        """
+        return CompiledProfile(self, self._compile())
+
+    def _compile(self):
+        """Return enforcement function specialized for this profile.
+
+        Returns:
+            Callable[[Union[str, bytes]], str]: Enforcement function.
+        """
+        if self._unstable is None:
+            self._build_tables()
+        if self._custom or self._override:
+            return self.enforce
+
+        # pylint: disable=too-many-locals
+        name = self.name
+        ascii_match = self._ascii_str.fullmatch
+        table = self._table
+        normalization_rule = self.normalization_rule
+        is_stable = self._is_stable
+        idempotence_check = self.idempotence_check
+        base_check = self.base.check
+        directionality_error = self._directionality_error
+        map_value = self._compile_mapping()
+
+        if not self._bidi:
+
+            def _enforce(value):
+                if type(value) is not str:  # pylint: disable=unidiomatic-typecheck
+                    value = _decode(value)
+                if ascii_match(value):
+                    return value.translate(table)
+                temp = normalization_rule(map_value(value) if map_value else value)
+                if temp != value and not is_stable(temp):
+                    temp = idempotence_check(temp)
+                if not temp:
+                    raise_error(name, value, -1, "empty")
+                result = base_check(temp)
+                if not result.ok:
+                    raise_error(name, result.value, result.offset, result.kind)
+                return result.value
+
+            return _enforce
+
+        def _enforce_bidi(value):
+            if type(value) is not str:  # pylint: disable=unidiomatic-typecheck
+                value = _decode(value)
+            if ascii_match(value):
+                return value.translate(table)
+            temp = normalization_rule(map_value(value) if map_value else value)
+            bidi = True
+            if temp != value and not is_stable(temp):
+                kind = directionality_error(temp)
+                if kind:
+                    raise_error(name, temp, -1, kind)
+                bidi = False
+                temp = idempotence_check(temp)
+            if not temp:
+                raise_error(name, value, -1, "empty")
+            result = base_check(temp, bidi)
+            if not result.ok:
+                raise_error(name, result.value, result.offset, result.kind)
+            return result.value
+
+        return _enforce_bidi
+
+    def _compile_mapping(self):
+        """Return the mapping stage of the compiled profile.
+
+        The fused table is skipped if it's empty, and the sequential rules are
+        skipped if no code point needs them.
+
+        Returns:
+            Optional[Callable[[str], str]]: Mapping function, or None if the
+                mapping rules never change a value.
+        """
+        translate = self._translate
+        if not self._table and type(self)._translate is Profile._translate:
+            translate = None
+        if self._fallback.pattern == _NEVER:
+            return translate
+
+        fallback = self._fallback.search
+        mapping_rules = self._apply_mapping_rules
+        if translate is None:
+
+            def _map_fallback(value):
+                return mapping_rules(value) if fallback(value) else value
+
+            return _map_fallback
+
+        def _map(value):
+            return mapping_rules(value) if fallback(value) else translate(value)
+
+        return _map
+
+    def _check_value(self, value):
+        """Check a string value the same way as `enforce`.
+
+        If the profile overrides `enforce`, the value is checked by calling
+        `enforce`. Otherwise, the shared engine is used.
+
+        Args:
+            value (str): String value to check.
+
+        Returns:
+            CheckResult: Named tuple (ok, value, kind, offset).
+        """
+        if self._override:
+            return self._check_enforce(value)
+        return self._check_cached(value)
+
+    def _check_enforce(self, value):
+        """Check a string value by calling `enforce`.
+
+        Args:
+            value (str): String value to check.
+
+        Returns:
+            CheckResult: Named tuple (ok, value, kind, offset).
+        """
+        try:
+            return CheckResult(True, self.enforce(value), None, None)
+        except UnicodeEncodeError as ex:
+            if ex.end - ex.start == 1:
+                offset = ex.start
+            else:
+                offset = -1
+            return CheckResult(False, ex.object, error_kind(ex), offset)
+
+    def _check_cached(self, value):
+        """Check a string value, using the enforcement cache if enabled.
+
+        Args:
+            value (str): String value to check.
+
+        Returns:
+            CheckResult: Result of `_check`.
+        """
+        cache = self._cache
+        if cache is None:
+            return self._check(value)
+        result = cache.get(value)
+        if result is None:
+            result = self._check(value)
+            cache.put(value, result)
+        return result
+
+    def _check(self, value):
+        """Check a string value against the profile.
+
+        This is the enforcement engine shared by `enforce`, `check` and the
+        other enforcement methods. It doesn't raise an exception when `value`
+        is disallowed.
+
+        Args:
+            value (str): String value to check.
+
+        Returns:
+            CheckResult: Named tuple (ok, value, kind, offset).
+        """
+        if self._custom:
+            temp, kind = self._apply_rules(value)
+            if kind:
+                return CheckResult(False, temp, kind, -1)
+            bidi = False
+        else:
+            temp = self._apply_mapping_rules(value)
+            temp = self.normalization_rule(temp)
+            bidi = self._bidi
+        # The rules are deterministic, so an unchanged value is its own fixed
+        # point. Otherwise, only run the idempotence check when the result
+        # contains code points that the mapping rules may change.
+        if temp != value and not self._is_stable(temp):
+            if bidi:
+                # The directionality rule applies to the first pass.
+                kind = self._directionality_error(temp)
+                if kind:
+                    return CheckResult(False, temp, kind, -1)
+                bidi = False
+            try:
+                temp = self.idempotence_check(temp)
+            except UnicodeEncodeError as ex:
+                return CheckResult(False, ex.object, error_kind(ex), -1)
         # Make sure the resulting value is not empty.
         if not temp:
-            raise_error(self.name, value, -1, "empty")
-        # Apply behavioral rules from the base string class last.
-        return self.base.enforce(temp, self.name)
+            return CheckResult(False, value, "empty", -1)
+        # Apply behavioral rules from the base string class last, together
+        # with the directionality rule if it hasn't been checked yet.
+        return self.base.check(temp, bidi)
+
+    def _apply_rules(self, value):
+        """Apply the five rules without raising an exception.
+
+        Args:
+            value (str): Value to enforce.
+
+        Returns:
+            Tuple[str, str]: Result of the five rules, and '' or the name of the
+                directionality rule that failed.
+        """
+        if self._custom:
+            try:
+                return self.apply_five_rules(value), ""
+            except UnicodeEncodeError as ex:
+                return ex.object, error_kind(ex)
+        temp = self._apply_mapping_rules(value)
+        temp = self.normalization_rule(temp)
+        return temp, self._directionality_error(temp)
 
     def apply_five_rules(self, value):
         """Apply the five rules specified by RFC 8264 in order.
@@ -79,9 +766,7 @@ class Profile:
         Returns:
             str: Enforced value.
         """
-        temp = self.width_mapping_rule(value)
-        temp = self.additional_mapping_rule(temp)
-        temp = self.case_mapping_rule(temp)
+        temp = self._apply_mapping_rules(value)
         temp = self.normalization_rule(temp)
         return self.directionality_rule(temp)
 
@@ -129,7 +814,10 @@ class Profile:
         Returns:
             str: Enforced value.
         """
-        return self.base.ucd.normalize("NFC", value)
+        ucd = self.base.ucd
+        if ucd.is_normalized("NFC", value):
+            return value
+        return ucd.normalize("NFC", value)
 
     def directionality_rule(self, value):
         """Apply directionality rule.
@@ -142,6 +830,17 @@ class Profile:
         """
         return value
 
+    def _directionality_error(self, value):
+        """Check the directionality rule without raising an exception.
+
+        Args:
+            value (str): Value to check.
+
+        Returns:
+            str: '' if no error, or name of the rule that failed.
+        """
+        return ""
+
     def idempotence_check(self, value):
         """Check that profile result is idempotent.
 
@@ -158,6 +857,195 @@ class Profile:
             raise_error(self.name, value, -1, "not_idempotent")
         return value
 
+    def _is_stable(self, value):
+        """Return true if `value` is known to be unchanged by the five rules.
+
+        `value` must be the output of `apply_five_rules`. The normalization
+        rule is idempotent, so the result is stable if none of its code points
+        can be changed by the mapping rules.
+
+        Profiles that override any of the five rules outside this module are
+        never considered stable; they always run `idempotence_check`.
+
+        Args:
+            value (str): Result of `apply_five_rules`.
+
+        Returns:
+            bool: True if `value` is a fixed point of the profile's rules.
+        """
+        if self._unstable is None:
+            self._build_tables()
+        if self._unstable is False:
+            return False
+        return not self._unstable.search(value)
+
+    def _apply_mapping_rules(self, value):
+        """Apply the width, additional and case mapping rules.
+
+        The three rules are fused into a single `str.translate` pass. The
+        sequential rules are used for profiles with custom rules, and for
+        values containing code points whose case mapping depends on context.
+
+        Args:
+            value (str): Value to enforce.
+
+        Returns:
+            str: Enforced value.
+        """
+        if self._unstable is None:
+            self._build_tables()
+        if self._table is False or self._fallback.search(value):
+            temp = self.width_mapping_rule(value)
+            temp = self.additional_mapping_rule(temp)
+            return self.case_mapping_rule(temp)
+        return self._translate(value)
+
+    def _translate(self, value):
+        """Apply the fused mapping table to `value`.
+
+        Args:
+            value (str): Value to enforce.
+
+        Returns:
+            str: Enforced value.
+        """
+        return value.translate(self._table)
+
+    def _map_char(self, char):
+        """Apply the mapping rules to a single code point.
+
+        Args:
+            char (str): Single character string.
+
+        Returns:
+            str: Mapped value; may be more than one character.
+        """
+        temp = self.width_mapping_rule(char)
+        temp = self.additional_mapping_rule(temp)
+        return self.case_mapping_rule(temp)
+
+    def _build_tables(self):
+        """Build the tables derived from the profile's mapping rules.
+
+        `_unstable` matches code points that may be changed by the mapping
+        rules. `_table` is the fused `str.translate` table for those code
+        points, stored as a flat string; see `_flat_table`. `_fallback`
+        matches code points that need the sequential rules: under `lower`, a
+        capital sigma maps to final sigma depending on the characters around
+        it. Code points outside the BMP, or that map to more than one code
+        point, are also left to the sequential rules.
+
+        `_ascii` and `_ascii_str` match non-empty ASCII values that are valid
+        once mapped. They are enforced by translating the ASCII code points
+        matched by `_ascii_changed`, using `_ascii_table` for bytes and
+        `_table` for strings.
+
+        The tables are immutable. `_unstable` is assigned last, and callers
+        check it to see whether the tables are built, so threads can read
+        the tables without a lock. Threads that build the tables at the same
+        time build equal tables.
+        """
+        if self._custom:
+            self._table = self._fallback = False
+            self._ascii = self._ascii_str = False
+            self._unstable = False
+            return
+        ascii_valid = []
+        ascii_changed = []
+        ascii_mapped = []
+        for cp in range(0x80):
+            mapped = self._map_char(chr(cp))
+            if len(mapped) == 1 and ord(mapped) < 0x80 and self.base.is_valid(mapped):
+                ascii_valid.append(chr(cp))
+                if ord(mapped) != cp:
+                    ascii_changed.append(cp)
+                    ascii_mapped.append(ord(mapped))
+        pattern = self._ascii_pattern("".join(ascii_valid))
+        self._ascii_changed = re.compile(char_class(ascii_changed).pattern.encode())
+        self._ascii_table = bytes.maketrans(bytes(ascii_changed), bytes(ascii_mapped))
+        self._ascii_str = re.compile(pattern)
+        self._ascii = re.compile(pattern.encode("ascii"))
+        chars = self._unstable_chars()
+        table = {}
+        fallback = []
+        for char in chars:
+            mapped = self._map_char(char)
+            if mapped == char:
+                continue
+            if len(mapped) == 1 and max(char, mapped) <= "\uffff":
+                table[ord(char)] = mapped
+            else:
+                fallback.append(ord(char))
+        if self._casemap is _caselower:
+            # The width and additional mapping rules never produce a sigma.
+            fallback.append(ord(_CAPITAL_SIGMA))
+        self._fallback = char_class(fallback)
+        self._table = _flat_table(table)
+        self._unstable = char_class(ord(char) for char in chars)
+
+    def _export_tables(self):
+        """Return the tables built by `_build_tables`, for `precis_i18n.shared`.
+
+        Compiled regexes are returned as their patterns.
+
+        Returns:
+            Optional[Dict[str, Union[str, bytes]]]: Tables, or None if the
+                profile has custom rules.
+        """
+        if self._unstable is None:
+            self._build_tables()
+        if self._custom:
+            return None
+        return {
+            "unstable": self._unstable.pattern,
+            "table": self._table,
+            "fallback": self._fallback.pattern,
+            "ascii": self._ascii_str.pattern,
+            "ascii_changed": self._ascii_changed.pattern,
+            "ascii_table": self._ascii_table,
+        }
+
+    def _import_tables(self, tables):
+        """Install tables returned by `_export_tables`, instead of building them.
+
+        Like `_build_tables`, `_unstable` is assigned last. If the tables are
+        already built, they are left alone.
+
+        Args:
+            tables (Dict[str, Union[str, bytes]]): Tables from `_export_tables`.
+        """
+        if self._unstable is not None or self._custom:
+            return
+        pattern = tables["ascii"]
+        self._ascii_changed = re.compile(tables["ascii_changed"])
+        self._ascii_table = tables["ascii_table"]
+        self._ascii_str = re.compile(pattern)
+        self._ascii = re.compile(pattern.encode("ascii"))
+        self._fallback = re.compile(tables["fallback"])
+        self._table = _FLAT_TABLES.setdefault(tables["table"], tables["table"])
+        self._unstable = re.compile(tables["unstable"])
+
+    def _ascii_pattern(self, chars):
+        """Return regex pattern for ASCII values enforced by the ASCII tables.
+
+        Args:
+            chars (str): ASCII characters that are valid once mapped.
+
+        Returns:
+            str: Regular expression pattern.
+        """
+        return "[%s]+" % re.escape(chars)
+
+    def _unstable_chars(self):
+        """Return set of code points that may be changed by the mapping rules.
+
+        Returns:
+            set: Set of single character strings.
+        """
+        if self._casemap:
+            return set(_case_changed(self._casemap))
+        return set()
+
 
 class Username(Profile):
     """Concrete class for Username profile.
@@ -201,13 +1089,26 @@ class Username(Profile):
         # Override
         return self.base.ucd.width_map(value)
 
+    def _unstable_chars(self):
+        # Override
+        chars = super()._unstable_chars()
+        chars.update(_changed_chars(self.width_mapping_rule, _WIDTH_RANGE))
+        return chars
+
     def directionality_rule(self, value):
+        # Override
+        kind = self._directionality_error(value)
+        if kind:
+            raise_error(self.name, value, -1, kind)
+        return value
+
+    def _directionality_error(self, value):
         # Override
         # Only apply the "bidi rule" if the string contains RTL characters.
         if has_rtl(value, self.base.ucd):
             if not bidi_rule(value, self.base.ucd):
-                raise_error(self.name, value, -1, "bidi_rule")
-        return value
+                return "bidi_rule"
+        return ""
 
 
 class OpaqueString(Profile):
@@ -251,6 +1152,12 @@ class OpaqueString(Profile):
         # Override
         return self.base.ucd.map_nonascii_space_to_ascii(value)
 
+    def _unstable_chars(self):
+        # Override
+        chars = super()._unstable_chars()
+        chars.update(_changed_chars(self.additional_mapping_rule, _SPACE_RANGE))
+        return chars
+
 
 class Nickname(Profile):
     """Concrete class for Nickname profile.
@@ -295,23 +1202,240 @@ class Nickname(Profile):
     def additional_mapping_rule(self, value):
         # Override
         temp = self.base.ucd.map_nonascii_space_to_ascii(value)
-        return re.sub(r"  +", " ", temp.strip(" "))
+        return _collapse_spaces(temp)
 
     def normalization_rule(self, value):
         # Override
-        return self.base.ucd.normalize("NFKC", value)
+        ucd = self.base.ucd
+        if ucd.is_normalized("NFKC", value):
+            return value
+        return ucd.normalize("NFKC", value)
 
     def idempotence_check(self, value):
         # Override
         # Nickname profile is not idempotent due to ordering of additional
-        # and case mapping rules, so we apply them again.
-        value = self.apply_five_rules(value)
-        return super().idempotence_check(value)
+        # and case mapping rules, so we apply them until the result is stable.
+        return self._fixed_point(value, 1)[0]
+
+    def fixed_point(self, value):
+        """Apply the five rules until the result is stable.
+
+        The Nickname profile is not idempotent due to the ordering of the
+        additional and case mapping rules. The rules are only applied again
+        when the previous result contains code points that the mapping rules
+        may change, or leading, trailing or repeated spaces.
+
+        If `value` is bytes, it's first decoded as UTF-8 to a string.
+
+        Args:
+            value (Union[str, bytes]): Value to enforce.
+
+        Returns:
+            Tuple[str, int]: Stable value and the number of times the five rules
+                were applied.
+
+        Raises:
+            UnicodeEncodeError: Value is not stable after three passes.
+            ValueError: `value` not a string or bytes.
+        """
+        value = _decode(value)
+        temp = self.apply_five_rules(value)
+        if temp == value or self._is_stable(temp):
+            return temp, 1
+        return self._fixed_point(temp, 1)
+
+    def _fixed_point(self, value, passes):
+        """Apply the five rules to `value` until the result is stable.
+
+        Args:
+            value (str): Result of applying the five rules `passes` times.
+            passes (int): Number of passes so far.
+
+        Returns:
+            Tuple[str, int]: Stable value and the total number of passes.
+
+        Raises:
+            UnicodeEncodeError: Value is not stable after `_MAX_PASSES` passes.
+        """
+        while True:
+            temp = self.apply_five_rules(value)
+            passes += 1
+            if temp == value:
+                return value, passes
+            if passes >= _MAX_PASSES:
+                raise_error(self.name, value, -1, "not_idempotent")
+            value = temp
+            if self._is_stable(value):
+                return value, passes
+
+    def _translate(self, value):
+        # Override
+        # The fused table maps spaces and case; leading, trailing and repeated
+        # spaces are handled afterwards. Case mapping never adds or removes
+        # spaces, so the result is the same.
+        return _collapse_spaces(value.translate(self._table))
+
+    def _map_char(self, char):
+        # Override
+        temp = self.base.ucd.map_nonascii_space_to_ascii(char)
+        return self.case_mapping_rule(temp)
+
+    def _ascii_pattern(self, chars):
+        # Override
+        # Leading, trailing and repeated spaces are handled by the additional
+        # mapping rule, not the per-character mapping.
+        return "[{0}]+(?: [{0}]+)*".format(re.escape(chars.replace(" ", "")))
+
+    def _is_stable(self, value):
+        # Override
+        # The additional mapping rule also trims and collapses spaces.
+        if value[:1] == " " or value[-1:] == " " or "  " in value:
+            return False
+        return super()._is_stable(value)
+
+    def _unstable_chars(self):
+        # Override
+        chars = super()._unstable_chars()
+        chars.update(_changed_chars(self.additional_mapping_rule, _SPACE_RANGE))
+        return chars
+
+
+def _decode(value):
+    """Return `value` as a string, decoding bytes as UTF-8.
+
+    Raises:
+        ValueError: `value` not a string or bytes.
+    """
+    # If we get called with a byte string, decode it first.
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if not isinstance(value, str):
+        raise ValueError("not a string")
+    return value
 
 
 def _casefold(s):
     return s.casefold()
 
 
+def _load(name, ucd_name, version):
+    """Return shared profile for `name`. Used by pickle."""
+    # Import here to avoid a circular import.
+    # pylint: disable=import-outside-toplevel
+    from precis_i18n.factory import get_profile
+
+    return get_profile(name, unicodedata=import_backend(ucd_name, version))
+
+
+def _is_named(profile):
+    """Return true if `get_profile` constructs `profile` by its name.
+
+    The profile registered under the name is constructed, and compared with
+    `profile` by class, name, case mapping function and base string class.
+    """
+    # Import here to avoid a circular import.
+    # pylint: disable=import-outside-toplevel
+    from precis_i18n.factory import _PROFILES, _profile_key
+
+    factory = _PROFILES.get(_profile_key(profile.name))
+    if factory is None:
+        return False
+    other = factory(profile.base.ucd)
+    # pylint: disable=protected-access
+    return (
+        type(other) is type(profile)
+        and other.name == profile.name
+        and other._casemap is profile._casemap
+        and type(other.base) is type(profile.base)
+    )
+
+
 def _caselower(s):
     return s.lower()
+
+
+def _collapse_spaces(s):
+    return re.sub(r"  +", " ", s.strip(" "))
+
+
+def _flat_table(mapping):
+    """Return a `str.translate` table for `mapping`, as a string.
+
+    The character at index `cp` is the mapping of code point `cp`. Code points
+    past the end of the string are left unchanged. Unlike a dict, the string
+    is a single flat buffer. Reading it doesn't touch the reference counts of
+    thousands of key and value objects, so the pages stay shared between
+    processes forked after the table is built. Profiles with identical tables
+    share the same string.
+
+    Args:
+        mapping (Dict[int, str]): Map from BMP code point to a BMP character.
+
+    Returns:
+        str: Translation table.
+    """
+    chars = [chr(cp) for cp in range(max(mapping, default=-1) + 1)]
+    for cp, char in mapping.items():
+        chars[cp] = char
+    table = "".join(chars)
+    return _FLAT_TABLES.setdefault(table, table)
+
+
+_CAPITAL_SIGMA = "\u03a3"
+
+# Pattern of a regex that never matches; see `char_class`.
+_NEVER = char_class(()).pattern
+
+# Maximum number of times the Nickname rules are applied to reach a stable
+# value.
+_MAX_PASSES = 3
+
+
+# Ranges of code points that may be changed by the width mapping rule and by
+# the non-ASCII space mapping.
+_WIDTH_RANGE = range(0xFF01, 0xFFF0)
+_SPACE_RANGE = range(0x0080, 0x3001)
+
+_RULES = (
+    "width_mapping_rule",
+    "additional_mapping_rule",
+    "case_mapping_rule",
+    "normalization_rule",
+    "directionality_rule",
+)
+
+# Cache of code points changed by each case mapping function.
+_CASE_CHANGED = {}
+
+# Translation tables built by `_flat_table`, shared by identical profiles.
+_FLAT_TABLES = {}
+
+
+def _case_changed(casemap):
+    """Return string of all code points changed by `casemap`.
+
+    The result is computed once and cached; case mapping uses Python's built-in
+    Unicode tables, not the profile's `UnicodeData`.
+    """
+    result = _CASE_CHANGED.get(casemap)
+    if result is None:
+        result = "".join(
+            char for char in map(chr, range(0x110000)) if casemap(char) != char
+        )
+        result = _CASE_CHANGED.setdefault(casemap, result)
+    return result
+
+
+def _changed_chars(rule, cps):
+    """Return list of code points in `cps` that are changed by `rule`."""
+    return [char for char in map(chr, cps) if rule(char) != char]
+
+
+def _has_custom_rules(cls):
+    """Return true if `cls` overrides any of the five rules outside this module."""
+    for klass in cls.__mro__:
+        if klass.__module__ == __name__:
+            return False
+        if any(rule in vars(klass) for rule in _RULES):
+            return True
+    return True
@@ -1,7 +1,13 @@
-from typing import Optional, Union
+from concurrent.futures import Executor
+from typing import Any, Iterable, List, Optional, Tuple, TypeVar, Union
 
-from precis_i18n.baseclass import BaseClass
+from precis_i18n.baseclass import BaseClass, CheckResult, Report
+from precis_i18n.cache import EnforcementCache
+from precis_i18n.compiled import CompiledProfile
 from precis_i18n.unicode import UnicodeData
+from precis_i18n.warmup import WarmUpReport
+
+_P = TypeVar("_P", bound="Profile")
 
 class Profile:
     def __init__(
@@ -11,7 +17,40 @@ class Profile:
     def base(self) -> BaseClass: ...
     @property
     def name(self) -> str: ...
+    @property
+    def cache(self) -> Optional[EnforcementCache]: ...
+    def __reduce__(self) -> Tuple[Any, ...]: ...
+    def __copy__(self: _P) -> _P: ...
+    def enable_cache(self, maxsize: int = ...) -> EnforcementCache: ...
+    def disable_cache(self) -> None: ...
+    def with_cache(self: _P, maxsize: int = ...) -> _P: ...
     def enforce(self, value: Union[bytes, str]) -> str: ...
+    async def enforce_async(
+        self,
+        value: Union[bytes, str],
+        *,
+        threshold: Optional[int] = ...,
+        executor: Optional[Executor] = ...
+    ) -> str: ...
+    def check(self, value: Union[bytes, str]) -> CheckResult: ...
+    def is_valid(self, value: Union[bytes, str]) -> bool: ...
+    def compare(self, value1: Union[bytes, str], value2: Union[bytes, str]) -> bool: ...
+    def enforce_many(
+        self, values: Iterable[Union[bytes, str]]
+    ) -> Tuple[List[Optional[str]], List[Optional[ValueError]]]: ...
+    def comparison_key(self, value: Union[bytes, str]) -> str: ...
+    def comparison_digest(
+        self, value: Union[bytes, str], digest_size: int = ...
+    ) -> bytes: ...
+    def comparison_digests(
+        self, values: Iterable[Union[bytes, str]], digest_size: int = ...
+    ) -> Tuple[List[Optional[bytes]], List[Optional[ValueError]]]: ...
+    def enforce_report(self, value: Union[bytes, str]) -> Report: ...
+    def enforce_bytes(self, buf: Union[bytes, bytearray, memoryview]) -> bytes: ...
+    def warm(
+        self, scripts: Optional[Iterable[str]] = ..., *, trace_memory: bool = ...
+    ) -> WarmUpReport: ...
+    def compile(self) -> CompiledProfile: ...
     def apply_five_rules(self, value: str) -> str: ...
     def width_mapping_rule(self, value: str) -> str: ...
     def additional_mapping_rule(self, value: str) -> str: ...
@@ -38,3 +77,4 @@ class Nickname(Profile):
     def additional_mapping_rule(self, value: str) -> str: ...
     def normalization_rule(self, value: str) -> str: ...
     def idempotence_check(self, value: str) -> str: ...
+    def fixed_point(self, value: Union[bytes, str]) -> Tuple[str, int]: ...
@@ -0,0 +1,241 @@
+"""Implements sharing of built tables with worker processes."""
+
+import json
+import struct
+
+import precis_i18n.unicode as _unicode
+from precis_i18n.factory import _PROFILES, get_profile, warm_up
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None
+
+# The block starts with the length of a JSON header, followed by the header
+# and the table data. The header maps each table to [kind, offset, size] in
+# the data. Strings are stored as UTF-32.
+_LENGTH = struct.Struct("<Q")
+_MAGIC = "precis_i18n.shared/1"
+_ENCODING = "utf-32-le"
+
+
+class SharedTables:
+    """Tables published in shared memory by `publish_tables`.
+
+    Pass `name` to `attach_tables` in each worker process. The publishing
+    process owns the shared memory block. Call `unlink` once the workers
+    have attached, or use the object as a context manager.
+    """
+
+    def __init__(self, shm, profiles):
+        self._shm = shm
+        self._profiles = profiles
+
+    @property
+    def name(self):
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def profiles(self):
+        """Names of the profiles whose tables are published."""
+        return self._profiles
+
+    def close(self):
+        """Close this process's access to the shared memory block."""
+        self._shm.close()
+
+    def unlink(self):
+        """Close and destroy the shared memory block."""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.unlink()
+
+
+def publish_tables(profiles=None, *, unicodedata=None):
+    """Build the tables of the given profiles and publish them.
+
+    The tables of the shared profile objects are built in this process, as
+    by `warm_up`, and copied into a new `multiprocessing.shared_memory`
+    block. Worker processes call `attach_tables` to install the tables in
+    their own shared profiles, instead of each building them again. This
+    matters when workers are started with 'spawn' or 'forkserver', which
+    don't inherit the tables from the parent.
+
+    Profiles with custom rules and the string classes have no tables to
+    publish.
+
+    Args:
+        profiles (Optional[Iterable[str]]): Profile names. The default is all
+            profiles, including registered profiles.
+        unicodedata (module): Alternative unicodedata module.
+
+    Returns:
+        SharedTables: Handle for the shared memory block.
+
+    Raises:
+        KeyError: Profile not found.
+        TypeError: `unicodedata` is not an importable module.
+        RuntimeError: `multiprocessing.shared_memory` is not available.
+    """
+    _check_shared_memory()
+    if profiles is None:
+        profiles = list(_PROFILES)
+    else:
+        profiles = list(profiles)
+    ucd = _unicode.get_unicode_data(unicodedata)
+    module, version = ucd.__reduce__()[1]
+    warm_up(profiles, unicodedata=unicodedata, trace_memory=False)
+
+    writer = _Writer()
+    header = {
+        "magic": _MAGIC,
+        "module": module,
+        "version": version,
+        "unicodedata": writer.add_tables(ucd._export_tables()),
+        "profiles": {},
+    }
+    published = []
+    for name in profiles:
+        export = getattr(
+            get_profile(name, unicodedata=unicodedata), "_export_tables", None
+        )
+        tables = export() if export is not None else None
+        if tables is not None:
+            header["profiles"][name] = writer.add_tables(tables)
+            published.append(name)
+
+    encoded = json.dumps(header).encode("utf-8")
+    start = _LENGTH.size + len(encoded)
+    shm = shared_memory.SharedMemory(create=True, size=start + len(writer.data))
+    try:
+        _LENGTH.pack_into(shm.buf, 0, len(encoded))
+        shm.buf[_LENGTH.size : start] = encoded
+        shm.buf[start : start + len(writer.data)] = writer.data
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return SharedTables(shm, tuple(published))
+
+
+def attach_tables(name):
+    """Install the tables published by `publish_tables` in this process.
+
+    The tables are installed in the shared `UnicodeData` object and the
+    shared profile objects returned by `get_profile`. Tables that this
+    process has already built are left alone. Use `attach_tables` as the
+    initializer of a process pool:
+
+        ProcessPoolExecutor(initializer=attach_tables, initargs=(tables.name,))
+
+    Python strings can't be views of a shared memory buffer, so each table is
+    copied out of the block; that is much faster than building it. The block
+    is closed before returning.
+
+    Args:
+        name (str): Name of the shared memory block.
+
+    Returns:
+        UnicodeData: The shared `UnicodeData` object for the tables.
+
+    Raises:
+        FileNotFoundError: Shared memory block not found.
+        KeyError: Profile not registered in this process.
+        ValueError: The block doesn't contain published tables, or this
+            process has a different Unicode version.
+        RuntimeError: `multiprocessing.shared_memory` is not available.
+    """
+    _check_shared_memory()
+    shm = _open(name)
+    try:
+        reader = _Reader(shm.buf)
+        header = reader.header
+        if not isinstance(header, dict) or header.get("magic") != _MAGIC:
+            raise ValueError("Not a block of PRECIS tables: %r" % name)
+        unicodedata = _unicode.import_backend(header["module"], header["version"])
+        ucd = _unicode.get_unicode_data(unicodedata)
+        ucd._import_tables(reader.read_tables(header["unicodedata"]))
+        for profile_name, refs in header["profiles"].items():
+            profile = get_profile(profile_name, unicodedata=unicodedata)
+            profile._import_tables(reader.read_tables(refs))
+    finally:
+        shm.close()
+    return ucd
+
+
+def _check_shared_memory():
+    if shared_memory is None:
+        raise RuntimeError("multiprocessing.shared_memory requires Python 3.8")
+
+
+def _open(name):
+    """Open an existing shared memory block without tracking it.
+
+    Before Python 3.13, the block is also registered with the resource
+    tracker, which is shared by a process pool and its parent.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name)
+
+
+class _Writer:
+    """Accumulates table data for `publish_tables`."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._refs = {}
+
+    def add_tables(self, tables):
+        """Append each table and return a dict of references to them."""
+        return {key: self._add(value) for key, value in tables.items()}
+
+    def _add(self, value):
+        # Profiles with the same mappings share a table.
+        key = (type(value), value)
+        ref = self._refs.get(key)
+        if ref is None:
+            if isinstance(value, str):
+                kind = "str"
+                value = value.encode(_ENCODING, "surrogatepass")
+            else:
+                kind = "bytes"
+            ref = self._refs[key] = [kind, len(self.data), len(value)]
+            self.data += value
+        return ref
+
+
+class _Reader:
+    """Reads the tables written by `_Writer` from a shared memory buffer."""
+
+    def __init__(self, buf):
+        self._buf = buf
+        (length,) = _LENGTH.unpack_from(buf, 0)
+        self._start = _LENGTH.size + length
+        try:
+            self.header = json.loads(self._read("json", _LENGTH.size, length))
+        except ValueError:
+            self.header = None
+
+    def read_tables(self, refs):
+        """Return a dict of the tables referenced by `refs`."""
+        tables = {}
+        for key, (kind, offset, size) in refs.items():
+            tables[key] = self._read(kind, self._start + offset, size)
+        return tables
+
+    def _read(self, kind, offset, size):
+        # Release the view at once, so the block can be closed.
+        with self._buf[offset : offset + size] as view:
+            if kind == "str":
+                return str(view, _ENCODING, "surrogatepass")
+            if kind == "json":
+                return str(view, "utf-8")
+            return bytes(view)
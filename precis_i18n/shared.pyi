@@ -0,0 +1,27 @@
+from types import TracebackType
+from typing import Any, Iterable, Optional, Tuple, Type
+
+from precis_i18n.unicode import UnicodeData
+
+shared_memory: Any
+
+class SharedTables:
+    def __init__(self, shm: Any, profiles: Tuple[str, ...]) -> None: ...
+    @property
+    def name(self) -> str: ...
+    @property
+    def profiles(self) -> Tuple[str, ...]: ...
+    def close(self) -> None: ...
+    def unlink(self) -> None: ...
+    def __enter__(self) -> SharedTables: ...
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None: ...
+
+def publish_tables(
+    profiles: Optional[Iterable[str]] = ..., *, unicodedata: Any = ...
+) -> SharedTables: ...
+def attach_tables(name: str) -> UnicodeData: ...
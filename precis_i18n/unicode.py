@@ -1,9 +1,11 @@
 """Implements the UnicodeData class."""
 
+import importlib
 import re
+import sys
 import unicodedata
 
-from precis_i18n.codepointset import CodepointSet
+from precis_i18n.codepointset import CodepointSet, char_class
 
 # pylint: disable=no-self-use
 
@@ -35,6 +37,17 @@ class UnicodeData:
     def version(self):
         return self._version
 
+    def __reduce__(self):
+        """Pickle by the name and Unicode version of the unicodedata module.
+
+        Raises:
+            TypeError: The unicodedata interface is not an importable module.
+        """
+        name = getattr(self._ucd, "__name__", None)
+        if name is None or sys.modules.get(name) is not self._ucd:
+            raise TypeError("cannot pickle UnicodeData for %r" % (self._ucd,))
+        return (_load, (name, self._ucd.unidata_version))
+
     # These methods call through to the underlying unicodedata object.
 
     def category(self, char):
@@ -49,6 +62,97 @@ class UnicodeData:
     def normalize(self, form, value):
         return self._ucd.normalize(form, value)
 
+    def is_normalized(self, form, value):
+        """Return true if `value` is known to be normalized.
+
+        Uses the `is_normalized` function of the underlying unicodedata object
+        when available (Python 3.8+). Otherwise, performs a conservative quick
+        check: the result is true only if `value` contains no code points
+        whose quick check property (NFC_QC or NFKC_QC) is No or Maybe, and no
+        combining marks. A false result means "normalize to find out".
+
+        The quick check tables are from Unicode 16.0. The quick check is not
+        used for later versions; their result is always false.
+
+        Args:
+            form (str): Normalization form: 'NFC' or 'NFKC'.
+            value (str): Value to check.
+
+        Returns:
+            bool: True if `value` is normalized.
+        """
+        is_normalized = getattr(self._ucd, "is_normalized", None)
+        if is_normalized is not None:
+            return is_normalized(form, value)
+        if self._version > _QUICK_CHECK_VERSION:
+            return False
+        regex = _QUICK_CHECK.get(form)
+        if regex is None:
+            regex = _QUICK_CHECK.setdefault(form, _quick_check_regex(form))
+        return not regex.search(value)
+
+    def warm(self, scripts=None):
+        """Build the tables that are otherwise built on first use.
+
+        The code point tables for the context rules are shared by all
+        `UnicodeData` objects. The tables for the given scripts are built,
+        along with the Default_Ignorable_Code_Point table that every non-ASCII
+        value needs. The "arabic" tables are also used for the other cursive
+        scripts.
+
+        Args:
+            scripts (Optional[Iterable[str]]): Script names, such as "greek"
+                or "han". The default is all scripts.
+
+        Raises:
+            ValueError: Unknown script name.
+        """
+        if scripts is None:
+            scripts = _SCRIPT_TABLES
+        tables = [_DEFAULT_IGNORABLE]
+        for script in scripts:
+            try:
+                tables.extend(_SCRIPT_TABLES[script.lower()])
+            except KeyError:
+                raise ValueError("Unknown script: %r" % script) from None
+        for table in tables:
+            table._ranges()  # pylint: disable=protected-access
+        if getattr(self._ucd, "is_normalized", None) is None:
+            for form in ("NFC", "NFKC"):
+                self.is_normalized(form, "")
+
+    def _export_tables(self):
+        """Return the tables built by `warm`, for `precis_i18n.shared`.
+
+        Returns:
+            Dict[str, str]: Code point ranges and quick check patterns.
+        """
+        # pylint: disable=protected-access
+        tables = {}
+        for name, table in _CODEPOINT_TABLES.items():
+            tables["ranges:" + name] = table._ranges()
+        for form, regex in _QUICK_CHECK.items():
+            tables["quick_check:" + form] = regex.pattern
+        return tables
+
+    def _import_tables(self, tables):
+        """Install tables returned by `_export_tables`.
+
+        Tables that are already built are left alone.
+
+        Args:
+            tables (Dict[str, str]): Tables from `_export_tables`.
+        """
+        # pylint: disable=protected-access
+        for key, value in tables.items():
+            kind, name = key.split(":", 1)
+            if kind == "ranges":
+                table = _CODEPOINT_TABLES[name]
+                if table._table is None:
+                    table._table = value
+            elif kind == "quick_check":
+                _QUICK_CHECK.setdefault(name, re.compile(value))
+
     def width_map(self, value):
         """Map half-width and full-width chars to their compat equivs.
 
@@ -142,6 +246,57 @@ class UnicodeData:
         return None
 
 
+# Shared UnicodeData adapters, keyed by unicodedata interface.
+_SHARED = {}
+
+
+def get_unicode_data(ucd=None):
+    """Return the shared `UnicodeData` adapter for `ucd`.
+
+    Args:
+        ucd (Union[module,object]): Implements `unicodedata` interface.
+
+    Returns:
+        UnicodeData: Shared adapter, or a new one if `ucd` is unhashable.
+    """
+    try:
+        return _SHARED[ucd]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable unicodedata interface can't be shared.
+        return UnicodeData(ucd)
+    return _SHARED.setdefault(ucd, UnicodeData(ucd))
+
+
+def import_backend(name, version):
+    """Import the unicodedata module `name` and check its Unicode version.
+
+    Args:
+        name (str): Module name, such as 'unicodedata' or 'unicodedata2'.
+        version (str): Expected `unidata_version`.
+
+    Returns:
+        module: The module, or None for the built-in unicodedata module.
+
+    Raises:
+        ImportError: Module not found.
+        ValueError: Module has a different Unicode version.
+    """
+    module = importlib.import_module(name)
+    if module.unidata_version != version:
+        raise ValueError(
+            "%s has Unicode version %s, expected %s"
+            % (name, module.unidata_version, version)
+        )
+    return None if module is unicodedata else module
+
+
+def _load(name, version):
+    """Return shared UnicodeData for unicodedata module `name`. Used by pickle."""
+    return get_unicode_data(import_backend(name, version))
+
+
 # https://www.unicode.org/Public/UNIDATA/DerivedCoreProperties.txt
 # Derived Property: Default_Ignorable_Code_Point
 _DEFAULT_IGNORABLE = CodepointSet(
@@ -175,7 +330,6 @@ E0100..E01EF
 E01F0..E0FFF
 """
 )
-assert len(_DEFAULT_IGNORABLE) == 4174
 
 # https://www.unicode.org/Public/UNIDATA/extracted/DerivedJoiningType.txt
 # Joining_Type=Dual_Joining
@@ -261,7 +415,6 @@ A840..A871
 1E900..1E943
 """
 )
-assert len(_JOINTYPE_DUAL_JOINING) == 612
 
 # https://www.unicode.org/Public/UNIDATA/extracted/DerivedJoiningType.txt
 # Joining_Type=Right_Joining
@@ -335,7 +488,6 @@ _JOINTYPE_RIGHT_JOINING = CodepointSet(
 10FC9
 """
 )
-assert len(_JOINTYPE_RIGHT_JOINING) == 153
 
 # https://www.unicode.org/Public/UNIDATA/extracted/DerivedJoiningType.txt
 # Joining_Type=Left_Joining
@@ -348,7 +500,6 @@ A872
 10FCB
 """
 )
-assert len(_JOINTYPE_LEFT_JOINING) == 5
 
 # https://www.unicode.org/Public/UNIDATA/extracted/DerivedJoiningType.txt
 # Joining_Type=Transparent
@@ -734,7 +885,6 @@ E0020..E007F
 E0100..E01EF
 """
 )
-assert len(_JOINTYPE_TRANSPARENT) == 2185
 
 # https://www.unicode.org/Public/UNIDATA/Scripts.txt
 # Greek
@@ -797,7 +947,6 @@ AB65
 1D245
 """
 )
-assert len(_GREEK_SCRIPT) == 518
 
 # https://www.unicode.org/Public/UNIDATA/Scripts.txt
 # Hebrew
@@ -827,7 +976,6 @@ FB43..FB44
 FB46..FB4F
 """
 )
-assert len(_HEBREW_SCRIPT) == 134
 
 # https://www.unicode.org/Public/UNIDATA/Scripts.txt
 # Hiragana, Katakana, Han
@@ -884,7 +1032,6 @@ FA70..FAD9
 31350..323AF
 """
 )
-assert len(_HIRAGANA_KATAKANA_HAN) == (381 + 321 + 99030)
 
 # https://www.unicode.org/Public/UNIDATA/HangulSyllableType.txt
 # Leading_Jamo, Vowel_Jamo, Trailing_Jamo
@@ -901,4 +1048,706 @@ D7B0..D7C6
 D7CB..D7FB
 """
 )
-assert len(_OLD_HANGUL_JAMO) == (125 + 95 + 137)
+
+# https://www.unicode.org/Public/16.0.0/ucd/DerivedNormalizationProps.txt
+# NFC_QC=No, NFC_QC=Maybe
+_NFC_QC = CodepointSet(
+    """
+# NFC_QC=No (1120)
+0340..0341
+0343..0344
+0374
+037E
+0387
+0958..095F
+09DC..09DD
+09DF
+0A33
+0A36
+0A59..0A5B
+0A5E
+0B5C..0B5D
+0F43
+0F4D
+0F52
+0F57
+0F5C
+0F69
+0F73
+0F75..0F76
+0F78
+0F81
+0F93
+0F9D
+0FA2
+0FA7
+0FAC
+0FB9
+1F71
+1F73
+1F75
+1F77
+1F79
+1F7B
+1F7D
+1FBB
+1FBE
+1FC9
+1FCB
+1FD3
+1FDB
+1FE3
+1FEB
+1FEE..1FEF
+1FF9
+1FFB
+1FFD
+2000..2001
+2126
+212A..212B
+2329..232A
+2ADC
+F900..FA0D
+FA10
+FA12
+FA15..FA1E
+FA20
+FA22
+FA25..FA26
+FA2A..FA6D
+FA70..FAD9
+FB1D
+FB1F
+FB2A..FB36
+FB38..FB3C
+FB3E
+FB40..FB41
+FB43..FB44
+FB46..FB4E
+1D15E..1D164
+1D1BB..1D1C0
+2F800..2FA1D
+# NFC_QC=Maybe (120)
+0300..0304
+0306..030C
+030F
+0311
+0313..0314
+031B
+0323..0328
+032D..032E
+0330..0331
+0338
+0342
+0345
+0653..0655
+093C
+09BE
+09D7
+0B3E
+0B56..0B57
+0BBE
+0BD7
+0C56
+0CC2
+0CD5..0CD6
+0D3E
+0D57
+0DCA
+0DCF
+0DDF
+102E
+1161..1175
+11A8..11C2
+1B35
+3099..309A
+110BA
+11127
+1133E
+11357
+113B8
+113BB
+113C2
+113C9
+114B0
+114BA
+114BD
+115AF
+11930
+1611E..16120
+16129
+16D67
+"""
+)
+
+# https://www.unicode.org/Public/16.0.0/ucd/DerivedNormalizationProps.txt
+# NFKC_QC=No, NFKC_QC=Maybe
+_NFKC_QC = CodepointSet(
+    """
+# NFKC_QC=No (4964)
+00A0
+00A8
+00AA
+00AF
+00B2..00B5
+00B8..00BA
+00BC..00BE
+0132..0133
+013F..0140
+0149
+017F
+01C4..01CC
+01F1..01F3
+02B0..02B8
+02D8..02DD
+02E0..02E4
+0340..0341
+0343..0344
+0374
+037A
+037E
+0384..0385
+0387
+03D0..03D6
+03F0..03F2
+03F4..03F5
+03F9
+0587
+0675..0678
+0958..095F
+09DC..09DD
+09DF
+0A33
+0A36
+0A59..0A5B
+0A5E
+0B5C..0B5D
+0E33
+0EB3
+0EDC..0EDD
+0F0C
+0F43
+0F4D
+0F52
+0F57
+0F5C
+0F69
+0F73
+0F75..0F79
+0F81
+0F93
+0F9D
+0FA2
+0FA7
+0FAC
+0FB9
+10FC
+1D2C..1D2E
+1D30..1D3A
+1D3C..1D4D
+1D4F..1D6A
+1D78
+1D9B..1DBF
+1E9A..1E9B
+1F71
+1F73
+1F75
+1F77
+1F79
+1F7B
+1F7D
+1FBB
+1FBD..1FC1
+1FC9
+1FCB
+1FCD..1FCF
+1FD3
+1FDB
+1FDD..1FDF
+1FE3
+1FEB
+1FED..1FEF
+1FF9
+1FFB
+1FFD..1FFE
+2000..200A
+2011
+2017
+2024..2026
+202F
+2033..2034
+2036..2037
+203C
+203E
+2047..2049
+2057
+205F
+2070..2071
+2074..208E
+2090..209C
+20A8
+2100..2103
+2105..2107
+2109..2113
+2115..2116
+2119..211D
+2120..2122
+2124
+2126
+2128
+212A..212D
+212F..2131
+2133..2139
+213B..2140
+2145..2149
+2150..217F
+2189
+222C..222D
+222F..2230
+2329..232A
+2460..24EA
+2A0C
+2A74..2A76
+2ADC
+2C7C..2C7D
+2D6F
+2E9F
+2EF3
+2F00..2FD5
+3000
+3036
+3038..303A
+309B..309C
+309F
+30FF
+3131..318E
+3192..319F
+3200..321E
+3220..3247
+3250..327E
+3280..33FF
+A69C..A69D
+A770
+A7F2..A7F4
+A7F8..A7F9
+AB5C..AB5F
+AB69
+F900..FA0D
+FA10
+FA12
+FA15..FA1E
+FA20
+FA22
+FA25..FA26
+FA2A..FA6D
+FA70..FAD9
+FB00..FB06
+FB13..FB17
+FB1D
+FB1F..FB36
+FB38..FB3C
+FB3E
+FB40..FB41
+FB43..FB44
+FB46..FBB1
+FBD3..FD3D
+FD50..FD8F
+FD92..FDC7
+FDF0..FDFC
+FE10..FE19
+FE30..FE44
+FE47..FE52
+FE54..FE66
+FE68..FE6B
+FE70..FE72
+FE74
+FE76..FEFC
+FF01..FFBE
+FFC2..FFC7
+FFCA..FFCF
+FFD2..FFD7
+FFDA..FFDC
+FFE0..FFE6
+FFE8..FFEE
+10781..10785
+10787..107B0
+107B2..107BA
+1CCD6..1CCF9
+1D15E..1D164
+1D1BB..1D1C0
+1D400..1D454
+1D456..1D49C
+1D49E..1D49F
+1D4A2
+1D4A5..1D4A6
+1D4A9..1D4AC
+1D4AE..1D4B9
+1D4BB
+1D4BD..1D4C3
+1D4C5..1D505
+1D507..1D50A
+1D50D..1D514
+1D516..1D51C
+1D51E..1D539
+1D53B..1D53E
+1D540..1D544
+1D546
+1D54A..1D550
+1D552..1D6A5
+1D6A8..1D7CB
+1D7CE..1D7FF
+1E030..1E06D
+1EE00..1EE03
+1EE05..1EE1F
+1EE21..1EE22
+1EE24
+1EE27
+1EE29..1EE32
+1EE34..1EE37
+1EE39
+1EE3B
+1EE42
+1EE47
+1EE49
+1EE4B
+1EE4D..1EE4F
+1EE51..1EE52
+1EE54
+1EE57
+1EE59
+1EE5B
+1EE5D
+1EE5F
+1EE61..1EE62
+1EE64
+1EE67..1EE6A
+1EE6C..1EE72
+1EE74..1EE77
+1EE79..1EE7C
+1EE7E
+1EE80..1EE89
+1EE8B..1EE9B
+1EEA1..1EEA3
+1EEA5..1EEA9
+1EEAB..1EEBB
+1F100..1F10A
+1F110..1F12E
+1F130..1F14F
+1F16A..1F16C
+1F190
+1F200..1F202
+1F210..1F23B
+1F240..1F248
+1F250..1F251
+1FBF0..1FBF9
+2F800..2FA1D
+# NFKC_QC=Maybe (120)
+0300..0304
+0306..030C
+030F
+0311
+0313..0314
+031B
+0323..0328
+032D..032E
+0330..0331
+0338
+0342
+0345
+0653..0655
+093C
+09BE
+09D7
+0B3E
+0B56..0B57
+0BBE
+0BD7
+0C56
+0CC2
+0CD5..0CD6
+0D3E
+0D57
+0DCA
+0DCF
+0DDF
+102E
+1161..1175
+11A8..11C2
+1B35
+3099..309A
+110BA
+11127
+1133E
+11357
+113B8
+113BB
+113C2
+113C9
+114B0
+114BA
+114BD
+115AF
+11930
+1611E..16120
+16129
+16D67
+"""
+)
+
+# https://www.unicode.org/Public/16.0.0/ucd/extracted/DerivedCombiningClass.txt
+# Canonical_Combining_Class != 0
+_COMBINING = CodepointSet(
+    """
+0300..034E
+0350..036F
+0483..0487
+0591..05BD
+05BF
+05C1..05C2
+05C4..05C5
+05C7
+0610..061A
+064B..065F
+0670
+06D6..06DC
+06DF..06E4
+06E7..06E8
+06EA..06ED
+0711
+0730..074A
+07EB..07F3
+07FD
+0816..0819
+081B..0823
+0825..0827
+0829..082D
+0859..085B
+0897..089F
+08CA..08E1
+08E3..08FF
+093C
+094D
+0951..0954
+09BC
+09CD
+09FE
+0A3C
+0A4D
+0ABC
+0ACD
+0B3C
+0B4D
+0BCD
+0C3C
+0C4D
+0C55..0C56
+0CBC
+0CCD
+0D3B..0D3C
+0D4D
+0DCA
+0E38..0E3A
+0E48..0E4B
+0EB8..0EBA
+0EC8..0ECB
+0F18..0F19
+0F35
+0F37
+0F39
+0F71..0F72
+0F74
+0F7A..0F7D
+0F80
+0F82..0F84
+0F86..0F87
+0FC6
+1037
+1039..103A
+108D
+135D..135F
+1714..1715
+1734
+17D2
+17DD
+18A9
+1939..193B
+1A17..1A18
+1A60
+1A75..1A7C
+1A7F
+1AB0..1ABD
+1ABF..1ACE
+1B34
+1B44
+1B6B..1B73
+1BAA..1BAB
+1BE6
+1BF2..1BF3
+1C37
+1CD0..1CD2
+1CD4..1CE0
+1CE2..1CE8
+1CED
+1CF4
+1CF8..1CF9
+1DC0..1DFF
+20D0..20DC
+20E1
+20E5..20F0
+2CEF..2CF1
+2D7F
+2DE0..2DFF
+302A..302F
+3099..309A
+A66F
+A674..A67D
+A69E..A69F
+A6F0..A6F1
+A806
+A82C
+A8C4
+A8E0..A8F1
+A92B..A92D
+A953
+A9B3
+A9C0
+AAB0
+AAB2..AAB4
+AAB7..AAB8
+AABE..AABF
+AAC1
+AAF6
+ABED
+FB1E
+FE20..FE2F
+101FD
+102E0
+10376..1037A
+10A0D
+10A0F
+10A38..10A3A
+10A3F
+10AE5..10AE6
+10D24..10D27
+10D69..10D6D
+10EAB..10EAC
+10EFD..10EFF
+10F46..10F50
+10F82..10F85
+11046
+11070
+1107F
+110B9..110BA
+11100..11102
+11133..11134
+11173
+111C0
+111CA
+11235..11236
+112E9..112EA
+1133B..1133C
+1134D
+11366..1136C
+11370..11374
+113CE..113D0
+11442
+11446
+1145E
+114C2..114C3
+115BF..115C0
+1163F
+116B6..116B7
+1172B
+11839..1183A
+1193D..1193E
+11943
+119E0
+11A34
+11A47
+11A99
+11C3F
+11D42
+11D44..11D45
+11D97
+11F41..11F42
+1612F
+16AF0..16AF4
+16B30..16B36
+16FF0..16FF1
+1BC9E
+1D165..1D169
+1D16D..1D172
+1D17B..1D182
+1D185..1D18B
+1D1AA..1D1AD
+1D242..1D244
+1E000..1E006
+1E008..1E018
+1E01B..1E021
+1E023..1E024
+1E026..1E02A
+1E08F
+1E130..1E136
+1E2AE
+1E2EC..1E2EF
+1E4EC..1E4EF
+1E5EE..1E5EF
+1E8D0..1E8D6
+1E944..1E94A
+"""
+)
+
+# Regexes matching code points that fail the normalization quick check, keyed
+# by form. Built on first use from the tables above.
+_QUICK_CHECK = {}
+
+# Unicode version of the quick check tables.
+_QUICK_CHECK_VERSION = 16.0
+
+
+def _quick_check_regex(form):
+    """Return regex matching code points that may fail the quick check.
+
+    Args:
+        form (str): Normalization form: 'NFC' or 'NFKC'.
+
+    Returns:
+        Pattern: Compiled regular expression.
+    """
+    table = _NFC_QC if form == "NFC" else _NFKC_QC
+    return char_class(
+        cp
+        for codepoints in (table, _COMBINING)
+        for lo, hi in codepoints.items()
+        for cp in range(lo, hi + 1)
+    )
+
+
+# Tables used by the context rules for each script, built by `warm`.
+_SCRIPT_TABLES = {
+    "arabic": (
+        _JOINTYPE_DUAL_JOINING,
+        _JOINTYPE_RIGHT_JOINING,
+        _JOINTYPE_LEFT_JOINING,
+        _JOINTYPE_TRANSPARENT,
+    ),
+    "greek": (_GREEK_SCRIPT,),
+    "hebrew": (_HEBREW_SCRIPT,),
+    "han": (_HIRAGANA_KATAKANA_HAN,),
+    "hiragana": (_HIRAGANA_KATAKANA_HAN,),
+    "katakana": (_HIRAGANA_KATAKANA_HAN,),
+    "hangul": (_OLD_HANGUL_JAMO,),
+}
+
+# Code point tables exported by `_export_tables`, by name.
+_CODEPOINT_TABLES = {
+    "default_ignorable": _DEFAULT_IGNORABLE,
+    "jointype_dual_joining": _JOINTYPE_DUAL_JOINING,
+    "jointype_right_joining": _JOINTYPE_RIGHT_JOINING,
+    "jointype_left_joining": _JOINTYPE_LEFT_JOINING,
+    "jointype_transparent": _JOINTYPE_TRANSPARENT,
+    "greek_script": _GREEK_SCRIPT,
+    "hebrew_script": _HEBREW_SCRIPT,
+    "hiragana_katakana_han": _HIRAGANA_KATAKANA_HAN,
+    "old_hangul_jamo": _OLD_HANGUL_JAMO,
+}
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 from precis_i18n.codepointset import CodepointSet
 
@@ -9,10 +9,15 @@ class UnicodeData:
     def __init__(self, ucd: Any = ...) -> None: ...
     @property
     def version(self) -> float: ...
+    def __reduce__(
+        self,
+    ) -> Tuple[Callable[[str, str], UnicodeData], Tuple[str, str]]: ...
     def category(self, char: str) -> str: ...
     def combining(self, char: str) -> int: ...
     def bidirectional(self, char: str) -> str: ...
     def normalize(self, form: str, value: str) -> str: ...
+    def is_normalized(self, form: str, value: str) -> bool: ...
+    def warm(self, scripts: Optional[Iterable[str]] = ...) -> None: ...
     def width_map(self, value: str) -> str: ...
     def map_nonascii_space_to_ascii(self, value: str) -> str: ...
     def default_ignorable(self, cp: int) -> bool: ...
@@ -28,6 +33,11 @@ class UnicodeData:
     def extended_arabic_indic(self, cp: int) -> bool: ...
     def valid_jointype(self, value: str, offset: int) -> bool: ...
 
+_SHARED: Dict[Any, UnicodeData]
+
+def get_unicode_data(ucd: Any = ...) -> UnicodeData: ...
+def import_backend(name: str, version: str) -> Any: ...
+
 _DEFAULT_IGNORABLE: CodepointSet
 _JOINTYPE_DUAL_JOINING: CodepointSet
 _JOINTYPE_RIGHT_JOINING: CodepointSet
@@ -37,3 +47,4 @@ _GREEK_SCRIPT: CodepointSet
 _HEBREW_SCRIPT: CodepointSet
 _HIRAGANA_KATAKANA_HAN: CodepointSet
 _OLD_HANGUL_JAMO: CodepointSet
+_SCRIPT_TABLES: Dict[str, Tuple[CodepointSet, ...]]
@@ -0,0 +1,9 @@
+from typing import Any, Callable, NamedTuple, Optional
+
+class WarmUpReport(NamedTuple):
+    seconds: float
+    memory: Optional[int]
+
+def measure(
+    func: Callable[..., Any], *args: Any, trace_memory: bool = ...
+) -> WarmUpReport: ...
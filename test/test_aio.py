@@ -0,0 +1,101 @@
+import asyncio
+import concurrent.futures
+import unittest
+
+from precis_i18n import get_profile
+from precis_i18n.aio import enforce_async, enforce_stream
+from precis_i18n.baseclass import error_kind
+
+VALUES = ["Juliet", "Kevin", "", "Ju liet", b"Romeo", 7] * 40
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def collect(stream):
+    items = []
+    async for item in stream:
+        items.append(item)
+    return items
+
+
+class AsyncValues:
+    """Async iterator over `values`. (Async generators require Python 3.6.)"""
+
+    def __init__(self, values):
+        self._values = iter(values)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0)
+        try:
+            return next(self._values)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class TestEnforceAsync(unittest.TestCase):
+    def test_enforce_async(self):
+        profile = get_profile("UsernameCaseMapped")
+        self.assertEqual(run(profile.enforce_async("Juliet")), "juliet")
+        self.assertEqual(run(enforce_async(profile, "Juliet", threshold=0)), "juliet")
+        self.assertEqual(run(enforce_async(profile, b"Juliet", threshold=0)), "juliet")
+        for threshold in (None, 0):
+            with self.assertRaises(UnicodeEncodeError) as cm:
+                run(profile.enforce_async("Ju liet", threshold=threshold))
+            self.assertEqual(error_kind(cm.exception), "spaces")
+
+    def test_enforce_stream(self):
+        profile = get_profile("UsernameCaseMapped")
+        results, errors = profile.enforce_many(VALUES)
+        expected = list(zip(results, [error and type(error) for error in errors]))
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            for values, threshold in (
+                (VALUES, None),
+                (VALUES, 0),
+                (AsyncValues(VALUES), 0),
+                (AsyncValues(VALUES), None),
+            ):
+                stream = enforce_stream(
+                    profile, values, chunksize=7, threshold=threshold, executor=executor
+                )
+                items = run(collect(stream))
+                self.assertEqual(
+                    [(result, error and type(error)) for result, error in items],
+                    expected,
+                )
+
+    def test_string_class(self):
+        profile = get_profile("IdentifierClass")
+        items = run(collect(enforce_stream(profile, ["abc", "a c"], threshold=0)))
+        self.assertEqual(items[0], ("abc", None))
+        self.assertEqual(error_kind(items[1][1]), "spaces")
+
+    def test_backpressure(self):
+        consumed = []
+
+        def values():
+            for i in range(100):
+                consumed.append(i)
+                yield "value%d" % i
+
+        async def take(count):
+            stream = enforce_stream(
+                get_profile("OpaqueString"), values(), chunksize=10, max_pending=2
+            )
+            for _ in range(count):
+                await stream.__anext__()
+
+        run(take(5))
+        self.assertEqual(len(consumed), 20)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            enforce_stream(get_profile("OpaqueString"), [], chunksize=0)
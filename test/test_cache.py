@@ -0,0 +1,142 @@
+import threading
+import unittest
+
+from precis_i18n import get_profile
+from precis_i18n.cache import CacheInfo, EnforcementCache
+
+
+class TestEnforcementCache(unittest.TestCase):
+    def test_lru(self):
+        cache = EnforcementCache(2)
+        self.assertEqual(cache.maxsize, 2)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", ("a", None))
+        cache.put("b", ("b", None))
+        self.assertEqual(cache.get("a"), ("a", None))
+        # "b" is now least recently used.
+        cache.put("c", ("c", None))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.info(), CacheInfo(1, 2, 1, 2, 2))
+
+        cache.clear()
+        self.assertEqual(cache.info(), CacheInfo(0, 0, 0, 2, 0))
+
+    def test_shards(self):
+        cache = EnforcementCache(1000)
+        self.assertEqual(len(cache._shards), 3)
+        self.assertEqual(sum(shard.maxsize for shard in cache._shards), 1000)
+        for i in range(2000):
+            cache.put(str(i), (str(i), None))
+        self.assertEqual(len(cache), 1000)
+        self.assertEqual(cache.get("1999"), ("1999", None))
+        self.assertIsNone(cache.get("0"))
+        self.assertEqual(cache.info(), CacheInfo(1, 1, 1000, 1000, 1000))
+
+        cache.clear()
+        self.assertEqual(cache.info(), CacheInfo(0, 0, 0, 1000, 0))
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            EnforcementCache(0)
+
+
+class TestProfileCache(unittest.TestCase):
+    def test_enforce(self):
+        profile = get_profile("UsernameCaseMapped", cached=False)
+        self.assertIsNone(profile.cache)
+        cache = profile.enable_cache(maxsize=10)
+        self.assertIs(profile.cache, cache)
+
+        self.assertEqual(profile.enforce("Juliet"), "juliet")
+        self.assertEqual(profile.enforce("Juliet"), "juliet")
+        self.assertEqual(profile.enforce(b"Juliet"), "juliet")
+        self.assertEqual(cache.info(), CacheInfo(2, 1, 0, 10, 1))
+
+        profile.disable_cache()
+        self.assertIsNone(profile.cache)
+        self.assertEqual(profile.enforce("Juliet"), "juliet")
+
+    def test_shared(self):
+        shared = get_profile("UsernameCaseMapped")
+        with self.assertRaises(ValueError):
+            shared.enable_cache()
+        with self.assertRaises(ValueError):
+            shared.disable_cache()
+
+        profile = shared.with_cache(maxsize=10)
+        self.assertIsNot(profile, shared)
+        self.assertIsNone(shared.cache)
+        self.assertEqual(profile.enforce("Juliet"), "juliet")
+        self.assertEqual(profile.cache.info(), CacheInfo(0, 1, 0, 10, 1))
+        profile.disable_cache()
+        self.assertIsNone(profile.cache)
+        self.assertIs(get_profile("UsernameCaseMapped"), shared)
+
+    def test_rejection(self):
+        profile = get_profile("UsernameCasePreserved", cached=False)
+        cache = profile.enable_cache()
+        errors = []
+        for _ in range(2):
+            with self.assertRaises(UnicodeEncodeError) as cm:
+                profile.enforce("Aא")
+            errors.append(cm.exception)
+        self.assertIsNot(errors[0], errors[1])
+        self.assertEqual(errors[0].args, errors[1].args)
+        self.assertEqual(str(errors[1]), str(errors[0]))
+        self.assertEqual(errors[1].reason, "DISALLOWED/bidi_rule")
+        self.assertEqual(cache.info().hits, 1)
+
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/spaces"):
+            profile.enforce(" J")
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/spaces"):
+            profile.enforce(" J")
+        with self.assertRaisesRegex(ValueError, "not a string"):
+            profile.enforce(1)
+
+    def test_threads(self):
+        profile = get_profile("NicknameCaseMapped", cached=False)
+        cache = profile.enable_cache(maxsize=50)
+        values = ["User %d" % i for i in range(100)]
+        errors = []
+
+        def _run():
+            for value in values * 5:
+                if profile.enforce(value) != value.lower():
+                    errors.append(value)
+
+        threads = [threading.Thread(target=_run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        info = cache.info()
+        self.assertEqual(info.hits + info.misses, 2000)
+        self.assertEqual(info.currsize, 50)
+
+    def test_threads_build_tables(self):
+        # Threads that enforce a new profile at the same time all build its
+        # tables, but get the same results.
+        profile = get_profile("UsernameCaseMapped", cached=False)
+        values = ["User", "Ünïcödé", "ΣΑΣ"]
+        expected = [value.lower() for value in values]
+        barrier = threading.Barrier(4)
+        results = []
+
+        def _run():
+            barrier.wait()
+            results.append([profile.enforce(value) for value in values])
+
+        threads = [threading.Thread(target=_run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [expected] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,7 +1,15 @@
 import codecs
+import io
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import precis_i18n.codec
+import precis_i18n.factory
+from precis_i18n import get_profile, register_profile
+from precis_i18n.baseclass import raise_error
+from precis_i18n.profile import Username
 
 
 class TestCodec(unittest.TestCase):
@@ -22,9 +30,9 @@ class TestCodec(unittest.TestCase):
             b"Juliet".decode("UsernameCasePreserved")
 
     def test_encode_errors(self):
-        # errors must be 'strict'; 'replace' and others are not supported.
-        with self.assertRaises(ValueError):
-            "Juliet".encode("opaquestring", errors="replace")
+        # Unknown error handlers are not supported.
+        with self.assertRaises(LookupError):
+            "J uliet".encode("UsernameCaseMapped", errors="_does_not_exist_")
         # non-matching codec names shouldn't work.
         with self.assertRaises(LookupError) as cm:
             "Juliet".encode("opaquestring_nonexistant")
@@ -41,3 +49,195 @@ class TestCodec(unittest.TestCase):
         # Search function must return None for non-existant codec.
         codec_info = _search("opaquestring_nonexistant")
         self.assertIs(codec_info, None)
+
+    def test_incremental_encoder(self):
+        encoder = codecs.getincrementalencoder("NicknameCaseMapped")()
+        self.assertEqual(encoder.encode(" Juliet \nRo"), b"juliet\n")
+        self.assertEqual(encoder.encode("meo\r"), b"")
+        self.assertEqual(encoder.encode("\nMer"), b"romeo\r\n")
+        self.assertEqual(encoder.encode("cutio", final=True), b"mercutio")
+        self.assertEqual(encoder.encode("", final=True), b"")
+
+        # A line split across calls is enforced as one value.
+        self.assertEqual(encoder.encode("Jul "), b"")
+        self.assertEqual(encoder.encode(" iet\n"), b"jul iet\n")
+
+        encoder.encode("Tybalt")
+        encoder.reset()
+        self.assertEqual(encoder.encode("Benvolio\n"), b"benvolio\n")
+
+        chunks = ["Ro", "meo \n", " Ju", "liet"]
+        self.assertEqual(
+            b"".join(codecs.iterencode(chunks, "NicknameCaseMapped")),
+            b"romeo\njuliet",
+        )
+
+        encoder = codecs.getincrementalencoder("IdentifierClass")()
+        self.assertEqual(encoder.encode("Juliet\n"), b"Juliet\n")
+
+        encoder = codecs.getincrementalencoder("UsernameCaseMapped")()
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/spaces"):
+            encoder.encode("Juliet\nJ uliet\n")
+
+    def test_discarded_line(self):
+        encoder = codecs.getincrementalencoder("UsernameCaseMapped")()
+        encoder.encode("Juliet")
+        with self.assertWarnsRegex(RuntimeWarning, "unterminated line"):
+            del encoder
+
+    def test_stream_writer(self):
+        stream = io.BytesIO()
+        writer = codecs.getwriter("UsernameCaseMapped")(stream)
+        writer.write("Juliet\nRo")
+        self.assertEqual(stream.getvalue(), b"juliet\n")
+        writer.writelines(["meo\n", "\uff2bevin"])
+        self.assertEqual(stream.getvalue(), b"juliet\nromeo\n")
+        writer.reset()
+        self.assertEqual(stream.getvalue(), b"juliet\nromeo\nkevin")
+
+        stream = io.BytesIO()
+        writer = codecs.getwriter("NicknameCaseMapped")(stream)
+        print("Alice", "Bob", file=writer)
+        print("Carol", end="", file=writer)
+        self.assertEqual(stream.getvalue(), b"alice bob\n")
+        writer.flush()
+        self.assertEqual(stream.getvalue(), b"alice bob\ncarol")
+
+    def test_codecs_open(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            with codecs.open(path, "w", encoding="OpaqueString") as out:
+                out.write("pass\u3000word\n")
+            with codecs.getwriter("NicknameCaseMapped")(open(path, "ab")) as out:
+                out.write(" Juliet ")
+            with open(path, "rb") as inp:
+                self.assertEqual(inp.read(), b"pass word\njuliet")
+            with open(path, "w", encoding="UsernameCaseMapped") as out:
+                out.write("Juliet\n")
+            with open(path, "rb") as inp:
+                self.assertEqual(inp.read(), b"juliet\n")
+        finally:
+            os.remove(path)
+
+    def test_unterminated_line(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            # The stream writer writes the final line when it's closed.
+            out = codecs.getwriter("UsernameCaseMapped")(open(path, "wb"))
+            out.write("Alice\nBob")
+            out.close()
+            with open(path, "rb") as inp:
+                self.assertEqual(inp.read(), b"alice\nbob")
+
+            # `codecs.open` and `open` never flush the encoder, so the final
+            # line must be terminated. An unterminated line is reported.
+            with self.assertWarnsRegex(RuntimeWarning, "unterminated line"):
+                with codecs.open(path, "w", encoding="UsernameCaseMapped") as out:
+                    out.write("Alice\nBob")
+                del out
+            with open(path, "rb") as inp:
+                self.assertEqual(inp.read(), b"alice\n")
+            with self.assertWarnsRegex(RuntimeWarning, "unterminated line"):
+                with open(path, "w", encoding="UsernameCaseMapped") as out:
+                    out.write("Alice\nBob")
+                del out
+            with open(path, "rb") as inp:
+                self.assertEqual(inp.read(), b"alice\n")
+            with open(path, "w", encoding="UsernameCaseMapped") as out:
+                print("Alice", file=out)
+                print("Bob", file=out)
+            with open(path, "rb") as inp:
+                self.assertEqual(inp.read(), b"alice\nbob\n")
+        finally:
+            os.remove(path)
+
+    def test_error_handlers(self):
+        self.assertEqual("Juliet".encode("UsernameCaseMapped", "replace"), b"juliet")
+        self.assertEqual("J ul iet".encode("UsernameCaseMapped", "replace"), b"j?ul?iet")
+        self.assertEqual("J ul iet".encode("UsernameCaseMapped", "ignore"), b"juliet")
+        self.assertEqual(
+            "J ul iet".encode("UsernameCaseMapped", "backslashreplace"),
+            b"j\\x20ul\\x20iet",
+        )
+        self.assertEqual("a\x00b".encode("IdentifierClass", "replace"), b"a?b")
+        # Violations of the entire string replace the entire string.
+        self.assertEqual("\u05d0*".encode("UsernameCaseMapped", "replace"), b"??")
+        self.assertEqual("\u05d0*".encode("UsernameCaseMapped", "ignore"), b"")
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/spaces"):
+            "J uliet".encode("UsernameCaseMapped", "strict")
+
+    def test_report_errors(self):
+        with precis_i18n.codec.collect_errors() as errors:
+            self.assertEqual("J uliet".encode("UsernameCaseMapped", "precis_report"), b"juliet")
+            self.assertEqual("Romeo".encode("UsernameCaseMapped", "precis_report"), b"romeo")
+            with precis_i18n.codec.collect_errors() as inner:
+                "\u05d0*".encode("UsernameCaseMapped", "precis_report")
+            self.assertEqual("".encode("OpaqueString", "precis_report"), b"")
+        self.assertEqual([ex.reason for ex in errors], ["DISALLOWED/spaces", "DISALLOWED/empty"])
+        self.assertEqual(errors[0].object, "j uliet")
+        self.assertEqual(errors[0].start, 1)
+        self.assertEqual([ex.reason for ex in inner], ["DISALLOWED/bidi_rule"])
+
+        # Outside `collect_errors`, the handler raises the error.
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/spaces"):
+            "J uliet".encode("UsernameCaseMapped", "precis_report")
+
+    def test_incremental_errors(self):
+        encoder = codecs.getincrementalencoder("UsernameCaseMapped")("replace")
+        self.assertEqual(encoder.encode("Juliet\nJ uliet\r\nRo"), b"juliet\nj?uliet\r\n")
+        self.assertEqual(encoder.encode("meo", final=True), b"romeo")
+
+        stream = io.BytesIO()
+        with precis_i18n.codec.collect_errors() as errors:
+            writer = codecs.getwriter("NicknameCaseMapped")(stream, "precis_report")
+            writer.write("Juliet\n\nRomeo\n")
+        self.assertEqual(stream.getvalue(), b"juliet\n\nromeo\n")
+        self.assertEqual([ex.reason for ex in errors], ["DISALLOWED/empty"])
+
+
+class TestRegisteredCodec(unittest.TestCase):
+    def setUp(self):
+        # Registered profiles are removed after each test.
+        patcher = mock.patch.dict(precis_i18n.factory._PROFILES)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(get_profile.cache_clear)
+
+    def test_registered_profile(self):
+        class DotUsername(Username):
+            def additional_mapping_rule(self, value):
+                return value.replace("_", ".")
+
+        register_profile(
+            "Test:DotUsername",
+            lambda ucd: DotUsername(ucd, "Test:DotUsername", casemap="lower"),
+        )
+        self.assertEqual("Juliet_C".encode("test:dotusername"), b"juliet.c")
+        stream = io.BytesIO()
+        writer = codecs.getwriter("Test:DotUsername")(stream)
+        writer.write("A_B\nC_D\n")
+        self.assertEqual(stream.getvalue(), b"a.b\nc.d\n")
+        with self.assertRaises(UnicodeEncodeError):
+            "Juliet C".encode("test:dotusername")
+
+    def test_registered_enforce(self):
+        class ShortUsername(Username):
+            def enforce(self, value):
+                result = super().enforce(value)
+                if len(result) > 8:
+                    raise_error(self.name, result, -1, "too_long")
+                return result
+
+        register_profile(
+            "Test:CodecShortUsername",
+            lambda ucd: ShortUsername(ucd, "Test:CodecShortUsername", casemap="lower"),
+        )
+        value = "JulietJulietJuliet"
+        with self.assertRaisesRegex(UnicodeEncodeError, "too_long"):
+            value.encode("Test:CodecShortUsername")
+        self.assertEqual(value.encode("Test:CodecShortUsername", "ignore"), b"")
+        with precis_i18n.codec.collect_errors() as errors:
+            value.encode("Test:CodecShortUsername", "precis_report")
+        self.assertEqual([ex.reason for ex in errors], ["DISALLOWED/too_long"])
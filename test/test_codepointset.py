@@ -1,9 +1,28 @@
+import re
 import unittest
 
-from precis_i18n.codepointset import CodepointSet
+import precis_i18n.unicode as _unicode
+from precis_i18n.codepointset import CodepointSet, char_class
 
 
 class TestCodepointSet(unittest.TestCase):
+    def test_lazy(self):
+        # The table is parsed on first use.
+        cps = CodepointSet("0000\nxyz")
+        with self.assertRaises(ValueError):
+            0 in cps
+
+    def test_unicode_tables(self):
+        self.assertEqual(len(_unicode._DEFAULT_IGNORABLE), 4174)
+        self.assertEqual(len(_unicode._JOINTYPE_DUAL_JOINING), 612)
+        self.assertEqual(len(_unicode._JOINTYPE_RIGHT_JOINING), 153)
+        self.assertEqual(len(_unicode._JOINTYPE_LEFT_JOINING), 5)
+        self.assertEqual(len(_unicode._JOINTYPE_TRANSPARENT), 2185)
+        self.assertEqual(len(_unicode._GREEK_SCRIPT), 518)
+        self.assertEqual(len(_unicode._HEBREW_SCRIPT), 134)
+        self.assertEqual(len(_unicode._HIRAGANA_KATAKANA_HAN), 381 + 321 + 99030)
+        self.assertEqual(len(_unicode._OLD_HANGUL_JAMO), 125 + 95 + 137)
+
     def test_contains(self):
         cps = CodepointSet("0000\n")
         actual = [cp in cps for cp in range(-1, 4)]
@@ -82,19 +101,19 @@ class TestCodepointSet(unittest.TestCase):
 
     def test_malformed_range(self):
         with self.assertRaises(ValueError):
-            CodepointSet("0002..0000\n0001")
+            len(CodepointSet("0002..0000\n0001"))
 
         with self.assertRaises(ValueError):
-            CodepointSet("0000..0001\n0000..0001\n0002")
+            len(CodepointSet("0000..0001\n0000..0001\n0002"))
 
         with self.assertRaises(ValueError):
-            CodepointSet("0000\n0002\n0002..0004")
+            len(CodepointSet("0000\n0002\n0002..0004"))
 
         with self.assertRaises(ValueError):
-            CodepointSet("110000")
+            len(CodepointSet("110000"))
 
         with self.assertRaises(ValueError):
-            CodepointSet("0000\n000G")
+            len(CodepointSet("0000\n000G"))
 
     def test_even_odd(self):
         data = "\n".join("%04X" % cp for cp in range(0, 10000, 2))
@@ -114,3 +133,14 @@ class TestCodepointSet(unittest.TestCase):
 
         cps = CodepointSet("\n  \n # comment  \n   \n")
         self.assertEqual(repr(cps), "CodepointSet('')")
+
+    def test_char_class(self):
+        regex = char_class([0x2D, 0x5D, 0x61, 0x62, 0x63, 0x10FFFF])
+        self.assertEqual(
+            regex.pattern,
+            "[%s%s%s-%s%s]" % tuple(re.escape(c) for c in "-]ac\U0010ffff"),
+        )
+        self.assertEqual(regex.findall("a-b]x\U0010ffff"), list("a-b]\U0010ffff"))
+
+        regex = char_class([])
+        self.assertIsNone(regex.search("abc"))
@@ -1,7 +1,17 @@
+import array
+import copy
+import itertools
+import pickle
+import sys
 import unittest
+from unittest import mock
 
 import precis_i18n
-from precis_i18n import get_profile
+import precis_i18n.factory
+import precis_i18n.unicode as _unicode
+from precis_i18n import get_profile, register_profile, warm_up
+from precis_i18n.baseclass import FreeFormClass, error_kind, raise_error
+from precis_i18n.profile import Profile, Username
 from precis_i18n.unicode import UnicodeData
 
 
@@ -16,6 +26,210 @@ class TestGetProfile(unittest.TestCase):
         profile = get_profile("UsernameCasePreserved", unicodedata=unicodedata)
         self.assertEqual(profile.enforce("E\u0301\u0301\u0301"), "\u00c9\u0301\u0301")
 
+    def test_cached(self):
+        import unicodedata
+
+        profile = get_profile("UsernameCaseMapped")
+        self.assertIs(get_profile("usernamecasemapped"), profile)
+        self.assertIsNot(get_profile("UsernameCaseMapped:ToLower"), profile)
+        self.assertIsNot(get_profile("UsernameCaseMapped", cached=False), profile)
+        self.assertIsNot(
+            get_profile("UsernameCaseMapped", unicodedata=unicodedata), profile
+        )
+        self.assertIs(
+            get_profile("UsernameCaseMapped", unicodedata=unicodedata),
+            get_profile("UsernameCaseMapped", unicodedata=unicodedata),
+        )
+
+        get_profile.cache_clear()
+        self.assertIsNot(get_profile("UsernameCaseMapped"), profile)
+        self.assertEqual(get_profile("UsernameCaseMapped").enforce("Juliet"), "juliet")
+
+    def test_shared_unicodedata(self):
+        profile1 = get_profile("UsernameCaseMapped")
+        profile2 = get_profile("OpaqueString", cached=False)
+        self.assertIs(profile1.base.ucd, profile2.base.ucd)
+
+
+class TestPickle(unittest.TestCase):
+    def test_profile(self):
+        profile = get_profile("UsernameCaseMapped")
+        data = pickle.dumps(profile)
+        self.assertLess(len(data), 200)
+        self.assertIs(pickle.loads(data), profile)
+
+        profile = get_profile("NicknameCaseMapped", cached=False)
+        self.assertIs(
+            pickle.loads(pickle.dumps(profile)), get_profile("NicknameCaseMapped")
+        )
+
+    def test_unregistered(self):
+        profile = Username(UnicodeData(), "MyName", "lower")
+        with self.assertRaises(TypeError):
+            pickle.dumps(profile)
+        # A builtin name with different settings is not the builtin profile.
+        profile = Username(UnicodeData(), "UsernameCaseMapped", "fold")
+        with self.assertRaises(TypeError):
+            pickle.dumps(profile)
+        profile = ShortUsername(UnicodeData(), "UsernameCaseMapped", "lower")
+        with self.assertRaises(TypeError):
+            pickle.dumps(profile)
+
+    def test_copy(self):
+        profile = Username(UnicodeData(), "MyName", "lower")
+        clone = copy.copy(profile)
+        self.assertIsNot(clone, profile)
+        self.assertEqual(clone.name, "MyName")
+        self.assertEqual(clone.enforce("Juliet"), "juliet")
+
+        profile = get_profile("UsernameCaseMapped", cached=False)
+        cache = profile.enable_cache()
+        clone = copy.copy(profile)
+        self.assertIsNot(clone, profile)
+        self.assertIsNot(clone, get_profile("UsernameCaseMapped"))
+        self.assertIs(clone.cache, cache)
+
+    def test_unicodedata(self):
+        import unicodedata
+
+        ucd = get_profile("OpaqueString").base.ucd
+        self.assertIs(pickle.loads(pickle.dumps(ucd)), ucd)
+
+        profile = get_profile("OpaqueString", unicodedata=unicodedata)
+        self.assertIs(pickle.loads(pickle.dumps(profile)), get_profile("OpaqueString"))
+
+        profile = get_profile("OpaqueString", unicodedata=unicodedata.ucd_3_2_0)
+        with self.assertRaises(TypeError):
+            pickle.dumps(profile)
+
+    def test_version_mismatch(self):
+        func, args = get_profile("OpaqueString").__reduce__()
+        with self.assertRaises(ValueError):
+            func(args[0], args[1], "1.0.0")
+
+
+class TestWarmUp(unittest.TestCase):
+    def test_warm(self):
+        profile = get_profile("NicknameCaseMapped", cached=False)
+        self.assertIsNone(profile._table)
+        report = profile.warm(["Greek"])
+        self.assertIsNotNone(profile._table)
+        self.assertIsNotNone(_unicode._GREEK_SCRIPT._table)
+        self.assertGreaterEqual(report.seconds, 0.0)
+        self.assertIsNone(report.memory)
+        self.assertEqual(profile.enforce("Kevin"), "kevin")
+
+        report = profile.warm(["Greek"], trace_memory=True)
+        self.assertIsInstance(report.memory, int)
+
+        base = get_profile("FreeFormClass", cached=False)
+        self.assertGreaterEqual(base.warm().seconds, 0.0)
+
+        with self.assertRaises(ValueError):
+            profile.warm(["Klingon"])
+
+    def test_warm_up(self):
+        get_profile.cache_clear()
+        report = warm_up(["UsernameCaseMapped", "OpaqueString"], scripts=["han"])
+        self.assertGreaterEqual(report.seconds, 0.0)
+        self.assertIsNotNone(get_profile("UsernameCaseMapped")._table)
+        self.assertIsNotNone(get_profile("OpaqueString")._table)
+        self.assertIsNotNone(_unicode._HIRAGANA_KATAKANA_HAN._table)
+
+        report = warm_up()
+        self.assertIsNone(report.memory)
+        self.assertIsNotNone(get_profile("NicknameCasePreserved")._table)
+
+        with self.assertRaises(KeyError):
+            warm_up(["_does_not_exist_"])
+
+
+class ShortUsername(Username):
+    """Username profile with a length limit."""
+
+    def enforce(self, value):
+        result = super().enforce(value)
+        if len(result) > 8:
+            raise_error(self.name, result, -1, "too_long")
+        return result
+
+
+class TestRegisterProfile(unittest.TestCase):
+    def setUp(self):
+        # Registered profiles are removed after each test.
+        patcher = mock.patch.dict(precis_i18n.factory._PROFILES)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(get_profile.cache_clear)
+
+    def test_register(self):
+        register_profile(
+            "Test:ShortUsername",
+            lambda ucd: ShortUsername(ucd, "Test:ShortUsername", casemap="lower"),
+        )
+        profile = get_profile("test:shortusername")
+        self.assertIsInstance(profile, ShortUsername)
+        self.assertIs(get_profile("Test:ShortUsername"), profile)
+        self.assertIs(profile.base.ucd, get_profile("UsernameCaseMapped").base.ucd)
+        self.assertEqual(profile.enforce("Juliet"), "juliet")
+        with self.assertRaises(UnicodeEncodeError) as cm:
+            profile.enforce("Juliet\u212a\u212a\u212a")
+        self.assertEqual(error_kind(cm.exception), "too_long")
+
+        # The subclass doesn't override the rules, so it keeps the fast
+        # tables. The compiled profile must still apply the length limit.
+        self.assertFalse(profile._custom)
+        with self.assertRaises(UnicodeEncodeError):
+            profile.compile()("Juliet\u212a\u212a\u212a")
+
+        get_profile.cache_clear()
+        self.assertIsNot(get_profile("Test:ShortUsername"), profile)
+
+    def test_override_enforce(self):
+        # Every enforcement method applies the length limit in `enforce`.
+        profile = ShortUsername(UnicodeData(), "Test:ShortUsername", casemap="lower")
+        value = "JulietJulietJuliet"
+        with self.assertRaisesRegex(UnicodeEncodeError, "too_long"):
+            profile.enforce(value)
+        self.assertFalse(profile.is_valid(value))
+        self.assertEqual(
+            profile.check(value), (False, "julietjulietjuliet", "too_long", -1)
+        )
+        self.assertEqual(profile.check("Juliet"), (True, "juliet", None, None))
+        with self.assertRaisesRegex(UnicodeEncodeError, "too_long"):
+            profile.enforce_bytes(value.encode("utf-8"))
+        self.assertEqual(profile.enforce_bytes(b"Juliet"), b"juliet")
+        self.assertFalse(profile.compare(value, value.lower()))
+        self.assertFalse(profile.compare(value, value))
+        self.assertTrue(profile.compare("Juliet", "juliet"))
+
+        results, errors = profile.enforce_many([value, "Juliet"])
+        self.assertEqual(results, [None, "juliet"])
+        self.assertEqual(error_kind(errors[0]), "too_long")
+
+        report = profile.enforce_report(value)
+        self.assertEqual(report, ("julietjulietjuliet", [(-1, "too_long")]))
+        self.assertEqual(profile.enforce_report("Juliet"), ("juliet", []))
+
+    @unittest.skipIf(sys.version_info < (3, 6), "requires hashlib.blake2b")
+    def test_override_enforce_digests(self):
+        profile = ShortUsername(UnicodeData(), "Test:ShortUsername", casemap="lower")
+        digests, errors = profile.comparison_digests(["JulietJulietJuliet"])
+        self.assertEqual(digests, [None])
+        self.assertEqual(error_kind(errors[0]), "too_long")
+
+    def test_duplicate(self):
+        def factory(ucd):
+            return Username(ucd, "Test:Duplicate")
+
+        register_profile("Test:Duplicate", factory)
+        register_profile("test_duplicate", factory)
+        with self.assertRaises(ValueError):
+            register_profile("Test:Duplicate", lambda ucd: None)
+        with self.assertRaises(ValueError):
+            register_profile("UsernameCaseMapped", factory)
+        self.assertEqual(get_profile("UsernameCaseMapped").name, "UsernameCaseMapped")
+
 
 class TestUsernameCasePreserved(unittest.TestCase):
     def test_enforce(self):
@@ -146,6 +360,364 @@ class TestNicknameCaseMapped(unittest.TestCase):
         self.assertEqual(profile.enforce("\u03d4"), "\u03cb")
 
 
+class TestEnforceMany(unittest.TestCase):
+    def test_enforce_many(self):
+        profile = get_profile("UsernameCaseMapped")
+        results, errors = profile.enforce_many(
+            ["Juliet", "", b"Romeo", " J", "Juliet", 1, [], b"\xff", " J"]
+        )
+        self.assertEqual(
+            results, ["juliet", None, "romeo", None, "juliet", None, None, None, None]
+        )
+        self.assertEqual(
+            [type(error).__name__ if error else None for error in errors],
+            [
+                None,
+                "UnicodeEncodeError",
+                None,
+                "UnicodeEncodeError",
+                None,
+                "ValueError",
+                "ValueError",
+                "UnicodeDecodeError",
+                "UnicodeEncodeError",
+            ],
+        )
+        self.assertEqual(errors[1].reason, "DISALLOWED/empty")
+        self.assertEqual(errors[3].reason, "DISALLOWED/spaces")
+        # Duplicate values share the same exception.
+        self.assertIs(errors[3], errors[8])
+
+    def test_empty(self):
+        profile = get_profile("OpaqueString")
+        self.assertEqual(profile.enforce_many(iter([])), ([], []))
+
+
+class TestCheck(unittest.TestCase):
+    def test_check(self):
+        profile = get_profile("UsernameCaseMapped")
+        self.assertEqual(profile.check("Juliet"), (True, "juliet", None, None))
+        self.assertEqual(profile.check(b"Juliet"), (True, "juliet", None, None))
+        self.assertEqual(profile.check("J uliet"), (False, "j uliet", "spaces", 1))
+        self.assertEqual(profile.check(""), (False, "", "empty", -1))
+        self.assertEqual(profile.check("\u05d0*"), (False, "\u05d0*", "bidi_rule", -1))
+        with self.assertRaisesRegex(ValueError, "not a string"):
+            profile.check(None)
+
+        result = profile.check("J uliet")
+        self.assertFalse(result.ok)
+        self.assertEqual(result.kind, "spaces")
+        self.assertEqual(result.offset, 1)
+
+    def test_is_valid(self):
+        profile = get_profile("OpaqueString")
+        self.assertTrue(profile.is_valid("correct horse"))
+        self.assertFalse(profile.is_valid("\u0000"))
+        self.assertFalse(profile.is_valid(""))
+
+    def test_base_class(self):
+        ident = get_profile("IdentifierClass")
+        self.assertEqual(ident.check("abc"), (True, "abc", None, None))
+        self.assertEqual(ident.check("a c"), (False, "a c", "spaces", 1))
+        self.assertTrue(ident.is_valid("abc"))
+        self.assertFalse(ident.is_valid("a c"))
+
+
+class TestCompare(unittest.TestCase):
+    def test_compare(self):
+        profile = get_profile("UsernameCaseMapped")
+        self.assertTrue(profile.compare("Juliet", "juliet"))
+        self.assertTrue(profile.compare(b"JULIET", "juliet"))
+        self.assertTrue(profile.compare("\uff2aULIET", "juliet"))
+        self.assertFalse(profile.compare("Juliet", "Romeo"))
+        self.assertFalse(profile.compare("J uliet", "J uliet"))
+        self.assertFalse(profile.compare("", ""))
+        self.assertFalse(profile.compare("juliet", "j uliet"))
+        self.assertFalse(profile.compare("\u05d0*", "\u05d0*"))
+        with self.assertRaisesRegex(ValueError, "not a string"):
+            profile.compare("juliet", None)
+
+        profile = get_profile("UsernameCasePreserved")
+        self.assertFalse(profile.compare("Juliet", "juliet"))
+        self.assertTrue(profile.compare("Juliet", "\uff2auliet"))
+
+    def test_nickname(self):
+        profile = get_profile("NicknameCaseMapped")
+        self.assertTrue(profile.compare("Foo Bar", "foo bar"))
+        self.assertTrue(profile.compare("Foo  Bar ", " foo bar"))
+        self.assertTrue(profile.compare("\u03a3", "\u03c3"))
+        self.assertFalse(profile.compare("  ", "  "))
+        self.assertFalse(profile.compare("foo bar", "foobar"))
+
+    def test_matches_enforce(self):
+        values = ["a", "A", "a b", "A  b", "\u212b", "\u00c5", "\uff21", "", " a"]
+        for name in ("UsernameCaseMapped", "OpaqueString", "NicknameCaseMapped"):
+            profile = get_profile(name)
+            for value1, value2 in itertools.product(values, repeat=2):
+                expected = profile.check(value1)
+                other = profile.check(value2)
+                self.assertEqual(
+                    profile.compare(value1, value2),
+                    expected.ok and other.ok and expected.value == other.value,
+                    (name, value1, value2),
+                )
+
+
+class TestComparisonKey(unittest.TestCase):
+    def test_comparison_key(self):
+        profile = get_profile("UsernameCaseMapped")
+        self.assertEqual(profile.comparison_key("Juliet"), "juliet")
+        self.assertEqual(profile.comparison_key(b"\xef\xbc\xaaULIET"), "juliet")
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/spaces"):
+            profile.comparison_key("J uliet")
+
+    @unittest.skipIf(sys.version_info < (3, 6), "requires hashlib.blake2b")
+    def test_comparison_digest(self):
+        profile = get_profile("UsernameCaseMapped")
+        digest = profile.comparison_digest("Juliet")
+        self.assertEqual(len(digest), 16)
+        self.assertEqual(digest, profile.comparison_digest("\uff2auliet"))
+        self.assertNotEqual(digest, profile.comparison_digest("Romeo"))
+        self.assertEqual(len(profile.comparison_digest("Juliet", digest_size=32)), 32)
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/empty"):
+            profile.comparison_digest("")
+        with self.assertRaises(ValueError):
+            profile.comparison_digest("Juliet", digest_size=0)
+
+        # Digest is tagged with the profile name.
+        other = get_profile("UsernameCaseMapped:ToLower")
+        self.assertEqual(other.comparison_key("Juliet"), "juliet")
+        self.assertNotEqual(other.comparison_digest("Juliet"), digest)
+
+    @unittest.skipIf(sys.version_info < (3, 6), "requires hashlib.blake2b")
+    def test_comparison_digests(self):
+        profile = get_profile("NicknameCaseMapped")
+        values = ["Foo Bar", " ", b"foo  bar", "Baz"]
+        digests, errors = profile.comparison_digests(values, digest_size=8)
+        for value, digest, error in zip(values, digests, errors):
+            if error is None:
+                self.assertEqual(digest, profile.comparison_digest(value, 8))
+            else:
+                self.assertIsNone(digest)
+                self.assertEqual(error_kind(error), "empty")
+        self.assertEqual(digests[0], digests[2])
+        self.assertNotEqual(digests[0], digests[3])
+
+    @unittest.skipIf(sys.version_info >= (3, 6), "hashlib.blake2b is available")
+    def test_comparison_digest_unavailable(self):
+        profile = get_profile("UsernameCaseMapped")
+        with self.assertRaises(NotImplementedError):
+            profile.comparison_digest("Juliet")
+        with self.assertRaises(NotImplementedError):
+            profile.comparison_digests(["Juliet"])
+
+
+class TestEnforceBytes(unittest.TestCase):
+    def test_enforce_bytes(self):
+        profile = get_profile("UsernameCasePreserved")
+        value = b"Juliet"
+        self.assertIs(profile.enforce_bytes(value), value)
+        self.assertEqual(profile.enforce_bytes(bytearray(b"Juliet")), b"Juliet")
+        self.assertEqual(profile.enforce_bytes(memoryview(b"Juliet")), b"Juliet")
+        self.assertEqual(profile.enforce_bytes(array.array("B", b"Juliet")), b"Juliet")
+        self.assertEqual(profile.enforce_bytes("\uff2bevin".encode("utf-8")), b"Kevin")
+        # Non-contiguous buffers.
+        self.assertEqual(profile.enforce_bytes(memoryview(b"JxUxL")[::2]), b"JUL")
+        data = memoryview(b"\xefx\xbcx\xab")[::2]
+        self.assertEqual(profile.enforce_bytes(data), b"K")
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/spaces"):
+            profile.enforce_bytes(b"J uliet")
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/empty"):
+            profile.enforce_bytes(b"")
+        with self.assertRaises(UnicodeDecodeError):
+            profile.enforce_bytes(b"\xff")
+        with self.assertRaisesRegex(ValueError, "not a bytes-like object"):
+            profile.enforce_bytes("Juliet")
+
+    def test_case_mapped(self):
+        profile = get_profile("UsernameCaseMapped")
+        self.assertEqual(profile.enforce_bytes(b"Juliet"), b"juliet")
+        self.assertEqual(profile.enforce_bytes(bytearray(b"juliet")), b"juliet")
+
+    def test_ascii_matches_enforce(self):
+        ascii_chars = [chr(cp) for cp in range(0x80)]
+        for name in ("UsernameCaseMapped", "OpaqueString", "NicknameCaseMapped"):
+            profile = get_profile(name)
+            for value in itertools.product(ascii_chars, " A", ascii_chars[::7]):
+                value = "".join(value)
+                try:
+                    expected = profile.enforce(value).encode("utf-8")
+                except UnicodeEncodeError as ex:
+                    expected = ex.reason
+                try:
+                    actual = profile.enforce_bytes(value.encode("utf-8"))
+                except UnicodeEncodeError as ex:
+                    actual = ex.reason
+                self.assertEqual(actual, expected)
+
+
+class TestEnforceReport(unittest.TestCase):
+    def test_enforce_report(self):
+        profile = get_profile("UsernameCaseMapped")
+        self.assertEqual(profile.enforce_report("Juliet"), ("juliet", []))
+        self.assertEqual(profile.enforce_report(b"Juliet"), ("juliet", []))
+        self.assertEqual(
+            profile.enforce_report("\uff2ba b\u0660\u06f0"),
+            (
+                "ka b\u0660\u06f0",
+                [
+                    (-1, "bidi_rule"),
+                    (2, "spaces"),
+                    (4, "arabic_indic"),
+                    (5, "extended_arabic_indic"),
+                ],
+            ),
+        )
+        self.assertEqual(profile.enforce_report(""), ("", [(-1, "empty")]))
+        self.assertEqual(
+            profile.enforce_report("\u05d0 *"),
+            ("\u05d0 *", [(-1, "bidi_rule"), (1, "spaces")]),
+        )
+        with self.assertRaisesRegex(ValueError, "not a string"):
+            profile.enforce_report(1)
+
+    def test_matches_enforce(self):
+        for name in ("UsernameCasePreserved", "OpaqueString", "NicknameCaseMapped"):
+            profile = get_profile(name)
+            for value in ("Juliet", " J\u00b7", "\u05d0*", "\u3000", "A\u0301"):
+                report = profile.enforce_report(value)
+                try:
+                    result = profile.enforce(value)
+                    self.assertEqual(report, (result, []))
+                except UnicodeEncodeError as ex:
+                    offset, kind = report.errors[0]
+                    self.assertEqual(kind, error_kind(ex))
+                    if offset >= 0:
+                        self.assertEqual(report.value, ex.object)
+                        self.assertEqual(offset, ex.start)
+
+
+class TestFusedMapping(unittest.TestCase):
+    def test_fused_mapping(self):
+        for name in (
+            "UsernameCasePreserved",
+            "UsernameCaseMapped",
+            "UsernameCaseMapped:CaseFold",
+            "OpaqueString",
+            "NicknameCaseMapped",
+            "NicknameCaseMapped:CaseFold",
+        ):
+            profile = get_profile(name)
+            for value in (
+                "Juliet",
+                "\uff2bevin\u3000\u212a",
+                "Fu\u00dfball \u0130\ufb00",
+                "\u3000 Ju  liet\u00a0",
+                "\u039f\u0394\u03a5\u03a3\u03a3\u0395\u03a5\u03a3",
+            ):
+                self.assertEqual(
+                    profile._apply_mapping_rules(value), _sequential(profile, value)
+                )
+
+    def test_final_sigma(self):
+        profile = get_profile("UsernameCaseMapped")
+        self.assertEqual(profile.enforce("\u0391\u03a3"), "\u03b1\u03c2")
+        self.assertEqual(profile.enforce("\u03a3\u0391"), "\u03c3\u03b1")
+        profile = get_profile("UsernameCaseMapped:CaseFold")
+        self.assertEqual(profile.enforce("\u0391\u03a3"), "\u03b1\u03c3")
+
+    def test_custom_rules(self):
+        class _CustomProfile(precis_i18n.profile.Username):
+            def width_mapping_rule(self, value):
+                return value.replace("-", "")
+
+        profile = _CustomProfile(UnicodeData(), "name", "lower")
+        self.assertEqual(profile.enforce("Jul-iet"), "juliet")
+
+
+class TestCompile(unittest.TestCase):
+    def test_matches_enforce(self):
+        values = [
+            "Juliet",
+            b"Juliet",
+            "J uliet",
+            " Foo  Bar ",
+            "\uff2a\uff55\uff4c\uff49\uff45\uff54",
+            "\u0391\u03a3",
+            "\u05d0*",
+            "\u212b",
+            "\u00a0",
+            "",
+            "\u0000",
+        ]
+        for name in (
+            "UsernameCasePreserved",
+            "UsernameCaseMapped",
+            "OpaqueString",
+            "NicknameCaseMapped",
+            "NicknameCaseMapped:CaseFold",
+        ):
+            profile = get_profile(name)
+            compiled = profile.compile()
+            self.assertEqual(compiled.name, name)
+            for value in values:
+                try:
+                    expected = profile.enforce(value)
+                except UnicodeEncodeError as ex:
+                    with self.assertRaises(UnicodeEncodeError) as cm:
+                        compiled(value)
+                    self.assertEqual(str(cm.exception), str(ex))
+                else:
+                    self.assertEqual(compiled(value), expected, (name, value))
+            with self.assertRaisesRegex(ValueError, "not a string"):
+                compiled(None)
+
+    def test_pickle(self):
+        compiled = get_profile("UsernameCaseMapped:ToLower").compile()
+        self.assertEqual(
+            repr(compiled), "CompiledProfile('UsernameCaseMapped:ToLower')"
+        )
+        loaded = pickle.loads(pickle.dumps(compiled))
+        self.assertEqual(loaded.name, "UsernameCaseMapped:ToLower")
+        self.assertEqual(loaded("Juliet"), "juliet")
+
+        # A compiled profile is pickled by its profile, so profiles that
+        # `get_profile` doesn't construct by name can't be pickled.
+        profile = Username(UnicodeData(), "UsernameCaseMapped", "fold")
+        self.assertEqual(profile.compile()("Stra\u00dfe"), "strasse")
+        with self.assertRaises(TypeError):
+            pickle.dumps(profile.compile())
+
+        import unicodedata
+
+        profile = get_profile("OpaqueString", unicodedata=unicodedata.ucd_3_2_0)
+        with self.assertRaises(TypeError):
+            pickle.dumps(profile.compile())
+
+    def test_specialized(self):
+        # Mapping stages that never change a code point are skipped.
+        profile = get_profile("UsernameCasePreserved")
+        profile.compile()
+        self.assertEqual(profile._compile_mapping(), profile._translate)
+        profile = Profile(FreeFormClass(UnicodeData()), "Test:Identity")
+        self.assertEqual(profile.compile()("Juliet \u00c9"), "Juliet \u00c9")
+        self.assertIsNone(profile._compile_mapping())
+
+    def test_custom_rules(self):
+        class _CustomProfile(precis_i18n.profile.Username):
+            def width_mapping_rule(self, value):
+                return value.replace("-", "")
+
+        compiled = _CustomProfile(UnicodeData(), "name", "lower").compile()
+        self.assertEqual(compiled("Jul-iet"), "juliet")
+
+
+def _sequential(profile, value):
+    temp = profile.width_mapping_rule(value)
+    temp = profile.additional_mapping_rule(temp)
+    return profile.case_mapping_rule(temp)
+
+
 class TestUsername(unittest.TestCase):
     def test_constructor(self):
         profile = precis_i18n.profile.Username(UnicodeData(), "name", "lower")
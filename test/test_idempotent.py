@@ -1,7 +1,7 @@
 import unittest
 
 from precis_i18n import get_profile
-from precis_i18n.profile import Username
+from precis_i18n.profile import Nickname, Username
 from precis_i18n.unicode import UnicodeData
 
 
@@ -17,6 +17,59 @@ class IdempotentTestCase(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "DISALLOWED/not_idempotent"):
             broken.enforce("x")
 
+    def test_skip_idempotence_check(self):
+        """Test that the second pass only runs when stability is unknown."""
+        calls = []
+
+        class _CountingProfile(Username):
+            def idempotence_check(self, value):
+                calls.append(value)
+                return super().idempotence_check(value)
+
+        profile = _CountingProfile(UnicodeData(), name="Counting", casemap="lower")
+        # Unchanged by the first pass.
+        self.assertEqual(profile.enforce("juliet"), "juliet")
+        # Changed, but result only contains stable code points.
+        self.assertEqual(profile.enforce("Juliet"), "juliet")
+        self.assertEqual(profile.enforce("\uff2bevin"), "kevin")
+        self.assertEqual(calls, [])
+
+        nickname = get_profile("NicknameCaseMapped")
+        self.assertFalse(nickname._is_stable(" juliet"))
+        self.assertFalse(nickname._is_stable("jul  iet"))
+        self.assertTrue(nickname._is_stable("jul iet"))
+        self.assertFalse(nickname._is_stable("jul\u3000iet"))
+
+    def test_custom_rules_not_stable(self):
+        """Test that profiles with custom rules always run the second pass."""
+
+        class _CustomProfile(Username):
+            def additional_mapping_rule(self, value):
+                return value.replace("-", "")
+
+        custom = _CustomProfile(UnicodeData(), name="Custom")
+        self.assertFalse(custom._is_stable("juliet"))
+        self.assertEqual(custom.enforce("jul-iet"), "juliet")
+
+    def test_nickname_fixed_point(self):
+        """Test that the Nickname engine reports the number of passes."""
+        nickname = get_profile("NicknameCaseMapped")
+        self.assertEqual(nickname.fixed_point("juliet"), ("juliet", 1))
+        self.assertEqual(nickname.fixed_point(b" Juliet  Smith "), ("juliet smith", 1))
+        # NFKC produces an uppercase letter, so a second pass is needed.
+        self.assertEqual(nickname.fixed_point("\u210c"), ("h", 2))
+        self.assertEqual(nickname.enforce("\u210c"), "h")
+
+        class _BrokenNickname(Nickname):
+            def additional_mapping_rule(self, value):
+                return "%s+" % value
+
+        broken = _BrokenNickname(UnicodeData(), name="Broken")
+        with self.assertRaisesRegex(ValueError, "DISALLOWED/not_idempotent"):
+            broken.fixed_point("x")
+        with self.assertRaisesRegex(ValueError, "DISALLOWED/not_idempotent"):
+            broken.enforce("x")
+
     def test_all_codepoints(self):
         """Verify all individual code points are idempotent."""
         profiles = [
@@ -0,0 +1,50 @@
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+import precis_i18n
+
+# Recorded budget for the cumulative time of `import precis_i18n`, in
+# microseconds. The package alone imports in about 1.5 ms; importing the
+# profile modules and their tables takes over 30 ms.
+IMPORT_BUDGET_US = 10000
+
+_IMPORT_TIME = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \| ( *)(\S+)$")
+
+
+def import_times(stmt):
+    """Run `stmt` with `-X importtime` and return cumulative time per module."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(precis_i18n.__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        stderr=subprocess.PIPE,
+        env=env,
+        check=True,
+        universal_newlines=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = _IMPORT_TIME.match(line)
+        if m:
+            times[m.group(4)] = int(m.group(2))
+    return times
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "requires PEP 562")
+class TestImport(unittest.TestCase):
+    def test_lazy_import(self):
+        times = import_times("import precis_i18n")
+        if not times:
+            self.skipTest("-X importtime not supported")
+        modules = sorted(name for name in times if name.startswith("precis_i18n"))
+        self.assertEqual(modules, ["precis_i18n"])
+        self.assertLess(times["precis_i18n"], IMPORT_BUDGET_US)
+
+    def test_getattr(self):
+        self.assertIs(precis_i18n.get_profile, precis_i18n.factory.get_profile)
+        self.assertIn("register_profile", dir(precis_i18n))
+        with self.assertRaises(AttributeError):
+            precis_i18n.does_not_exist
@@ -0,0 +1,39 @@
+import unittest
+
+from precis_i18n import get_profile
+from precis_i18n.baseclass import error_kind
+from precis_i18n.parallel import enforce_parallel
+
+VALUES = ["Juliet", "Kevin", "", "Ju liet", b"Romeo", "Kevin", 7] * 50
+
+
+class TestEnforceParallel(unittest.TestCase):
+    def test_order(self):
+        expected = get_profile("UsernameCaseMapped").enforce_many(VALUES)
+        for workers in (1, 2):
+            results, errors = enforce_parallel(
+                "UsernameCaseMapped", iter(VALUES), workers=workers, chunksize=16
+            )
+            self.assertEqual(results, expected[0])
+            self.assertEqual(
+                [error and type(error) for error in errors],
+                [error and type(error) for error in expected[1]],
+            )
+            self.assertEqual(error_kind(errors[3]), "spaces")
+
+    def test_string_class(self):
+        results, errors = enforce_parallel(
+            "IdentifierClass", ["abc", "a c"], workers=2, chunksize=1
+        )
+        self.assertEqual(results, ["abc", None])
+        self.assertIsNone(errors[0])
+        self.assertEqual(error_kind(errors[1]), "spaces")
+
+    def test_empty(self):
+        self.assertEqual(enforce_parallel("OpaqueString", [], workers=2), ([], []))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            enforce_parallel("OpaqueString", [], workers=0)
+        with self.assertRaises(KeyError):
+            enforce_parallel("_does_not_exist_", [], workers=1)
@@ -1,12 +1,14 @@
 # test_precis.py
 
+import itertools
 import platform
 import sys
+import unicodedata
 import unittest
 
 import precis_i18n.context as pc
 from precis_i18n.baseclass import FreeFormClass, IdentifierClass
-from precis_i18n.bidi import bidi_rule, has_rtl
+from precis_i18n.bidi import bidi_rule, bidi_rule_failed, has_rtl
 from precis_i18n.derived import derived_property
 from precis_i18n.unicode import UnicodeData, _version_to_float
 
@@ -53,6 +55,24 @@ class TestBidiRule(unittest.TestCase):
         self.assertFalse(has_rtl("Juliet+", UCD))
         self.assertTrue(has_rtl("\u05d0+", UCD))
 
+    def test_bidi_rule_failed(self):
+        chars = [L, R, AL, EN, AN, NSM, P]
+        for size in range(1, 5):
+            for value in map("".join, itertools.product(chars, repeat=size)):
+                bidi = [UCD.bidirectional(char) for char in value]
+                last = ([b for b in bidi if b != "NSM"] or [None])[-1]
+                expected = has_rtl(value, UCD) and not bidi_rule(value, UCD)
+                self.assertEqual(bidi_rule_failed(bidi[0], set(bidi), last), expected, ascii(value))
+
+    def test_check_bidi(self):
+        ident = IdentifierClass(UCD)
+        self.assertEqual(ident.check(R + EN, bidi=True), (True, R + EN, None, None))
+        self.assertEqual(ident.check(L + " ", bidi=True), (False, L + " ", "spaces", 1))
+        # Failure of the Bidi Rule is reported before disallowed characters.
+        self.assertEqual(ident.check(R + " " + P, bidi=True), (False, R + " " + P, "bidi_rule", -1))
+        self.assertEqual(ident.check(R + " " + P), (False, R + " " + P, "spaces", 1))
+        self.assertEqual(ident.check("", bidi=True), (True, "", None, None))
+
 
 class TestPrecisIdentifierClass(unittest.TestCase):
     def test_valid_identifier(self):
@@ -97,6 +117,22 @@ class TestPrecisIdentifierClass(unittest.TestCase):
         ):
             ident.enforce("\u1FBF")
 
+    def test_enforce_report(self):
+        ident = IdentifierClass(UCD)
+        self.assertEqual(ident.enforce_report("abc"), ("abc", []))
+        self.assertEqual(
+            ident.enforce_report(" a\xadb\u00b7c\u200d"),
+            (
+                " a\xadb\u00b7c\u200d",
+                [
+                    (0, "spaces"),
+                    (2, "precis_ignorable_properties"),
+                    (4, "middle_dot"),
+                    (6, "zero_width_joiner"),
+                ],
+            ),
+        )
+
 
 class TestPrecisFreeformClass(unittest.TestCase):
     def test_valid_freeform(self):
@@ -256,6 +292,28 @@ class TestPrecisContextRule(unittest.TestCase):
             pc.rule_extended_arabic_indic("\u06f0\u06f1\u06f2\u0660", 0, UCD)
         )
 
+    def test_context_rule_memo(self):
+        # Whole-string rules are only evaluated once per memo.
+        value = "\u0660" * 3 + "\u06f0"
+        memo = {}
+        self.assertEqual(pc.context_rule_error(value, 0, UCD, memo), "arabic_indic")
+        self.assertEqual(memo, {pc.rule_arabic_indic: False})
+        memo[pc.rule_arabic_indic] = True
+        self.assertEqual(pc.context_rule_error(value, 1, UCD, memo), "")
+        self.assertEqual(pc.context_rule_error(value, 3, UCD, memo), "extended_arabic_indic")
+        self.assertEqual(len(memo), 2)
+
+        # Rules that depend on the offset are not memoized.
+        memo = {}
+        self.assertEqual(pc.context_rule_error("\u006c\u00b7\u006c", 1, UCD, memo), "")
+        self.assertEqual(memo, {})
+
+        # Long strings that trigger a whole-string rule at every offset.
+        ident = IdentifierClass(UCD)
+        self.assertEqual(ident.enforce("\u30fb" * 5000 + "\u30a2"), "\u30fb" * 5000 + "\u30a2")
+        with self.assertRaisesRegex(UnicodeEncodeError, "DISALLOWED/katakana_middle_dot"):
+            ident.enforce("\u30fb" * 5000)
+
     def test_context_rule(self):
         def _context_rule(value, offset, ucd):
             return not pc.context_rule_error(value, offset, ucd)
@@ -359,6 +417,43 @@ class TestPrecisUnicodeData(unittest.TestCase):
             " . .  . . . . . ",
         )
 
+    def test_is_normalized(self):
+        class _NoQuickCheck:
+            # unicodedata interface without `is_normalized`, with a Unicode
+            # version covered by the quick check tables.
+            unidata_version = "16.0.0"
+            combining = staticmethod(unicodedata.combining)
+            decomposition = staticmethod(unicodedata.decomposition)
+            normalize = staticmethod(unicodedata.normalize)
+
+        for ucd in (UCD, UnicodeData(_NoQuickCheck())):
+            self.assertTrue(ucd.is_normalized("NFC", "juliet"))
+            self.assertTrue(ucd.is_normalized("NFC", "\u00e9"))
+            self.assertTrue(ucd.is_normalized("NFC", "\u4e2d\u6587"))
+            self.assertFalse(ucd.is_normalized("NFC", "e\u0301"))
+            self.assertFalse(ucd.is_normalized("NFC", "\u212b"))
+            self.assertFalse(ucd.is_normalized("NFC", "\u1100\u1161"))
+            self.assertTrue(ucd.is_normalized("NFC", "\uff2b"))
+            self.assertFalse(ucd.is_normalized("NFKC", "\uff2b"))
+            self.assertFalse(ucd.is_normalized("NFC", "a\u0591\u05b0"))
+
+        # The quick check tables must flag every code point that normalization
+        # changes.
+        ucd = UnicodeData(_NoQuickCheck())
+        for form in ("NFC", "NFKC"):
+            for cp in range(0x10000):
+                char = chr(cp)
+                if ucd.is_normalized(form, char):
+                    self.assertEqual(unicodedata.normalize(form, char), char)
+
+    def test_is_normalized_later_version(self):
+        # Later Unicode versions than the tables are never quick checked.
+        class _Later:
+            unidata_version = "99.0.0"
+            normalize = staticmethod(unicodedata.normalize)
+
+        self.assertFalse(UnicodeData(_Later()).is_normalized("NFC", "juliet"))
+
     def test_default_ignorable_code_point(self):
         self.assertTrue(UCD.default_ignorable(0x00AD))
         self.assertFalse(UCD.default_ignorable(0x00AE))
@@ -0,0 +1,61 @@
+import concurrent.futures
+import multiprocessing
+import unittest
+
+from precis_i18n import get_profile
+from precis_i18n.shared import attach_tables, publish_tables, shared_memory
+from precis_i18n.unicode import get_unicode_data
+
+
+@unittest.skipIf(shared_memory is None, "requires multiprocessing.shared_memory")
+class TestSharedTables(unittest.TestCase):
+    def test_attach(self):
+        with publish_tables(["UsernameCaseMapped", "IdentifierClass"]) as tables:
+            self.assertEqual(tables.profiles, ("UsernameCaseMapped",))
+            expected = get_profile("UsernameCaseMapped")._export_tables()
+            get_profile.cache_clear()
+            try:
+                self.assertIs(attach_tables(tables.name), get_unicode_data())
+                profile = get_profile("UsernameCaseMapped")
+                self.assertIsNotNone(profile._unstable)
+                self.assertEqual(profile._export_tables(), expected)
+                self.assertEqual(profile.enforce("ＪＵＬＩＥＴ"), "juliet")
+            finally:
+                get_profile.cache_clear()
+
+    def test_spawn(self):
+        context = multiprocessing.get_context("spawn")
+        profile = get_profile("NicknameCaseMapped")
+        with publish_tables(["NicknameCaseMapped"]) as tables:
+            with concurrent.futures.ProcessPoolExecutor(
+                1,
+                mp_context=context,
+                initializer=attach_tables,
+                initargs=(tables.name,),
+            ) as executor:
+                # The worker's profile is built before it enforces a value.
+                unstable = executor.submit(getattr, profile, "_unstable").result()
+                result = executor.submit(profile.enforce, " Juliet ").result()
+        self.assertEqual(unstable, profile._unstable)
+        self.assertEqual(result, "juliet")
+
+    def test_unlink(self):
+        with publish_tables(["OpaqueString"]) as tables:
+            name = tables.name
+        with self.assertRaises(FileNotFoundError):
+            attach_tables(name)
+
+    def test_invalid(self):
+        shm = shared_memory.SharedMemory(create=True, size=64)
+        try:
+            with self.assertRaisesRegex(ValueError, "Not a block of PRECIS tables"):
+                attach_tables(shm.name)
+        finally:
+            shm.close()
+            shm.unlink()
+        with self.assertRaises(KeyError):
+            publish_tables(["_does_not_exist_"])
+
+
+if __name__ == "__main__":
+    unittest.main()
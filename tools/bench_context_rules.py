@@ -0,0 +1,27 @@
+# Benchmark context rules on long strings that trigger them repeatedly.
+#
+# The Katakana middle dot and Arabic-Indic digit rules test the entire string.
+# The time per character should stay flat as the length grows.
+
+import timeit
+
+from precis_i18n import get_profile
+
+profile = get_profile("FreeFormClass")
+
+INPUTS = {
+    "katakana_middle_dot": lambda n: "・" * (n - 1) + "ア",
+    "arabic_indic": lambda n: "٠" * n,
+    "extended_arabic_indic": lambda n: "۰" * n,
+    "mixed_digits": lambda n: "٠" * (n - 1) + "۰",
+}
+
+for name, make in INPUTS.items():
+    for size in (100, 1000, 5000):
+        value = make(size)
+        number = max(1, 20000 // size)
+        elapsed = min(timeit.repeat(lambda: profile.is_valid(value), number=number))
+        print(
+            "%-22s %5d chars: %8.2f us/char"
+            % (name, size, elapsed / number / size * 1e6)
+        )
@@ -0,0 +1,81 @@
+# Measure the memory that forked workers stop sharing with their parent.
+#
+# The parent warms every profile and calls `gc.freeze()`, like a pre-fork
+# server. Each worker then translates every BMP code point with each
+# profile's mapping table, and reports how much its Private_Dirty memory grew.
+# Those pages were copied from the parent on write.
+#
+# Pass --dict to convert the mapping tables to dicts first, which was the
+# table layout before version 1.2. Linux only.
+#
+#   PYTHONPATH=. python tools/bench_fork_sharing.py [--dict] [workers]
+
+import gc
+import os
+import sys
+
+import precis_i18n
+import precis_i18n.factory
+
+TEXT = "".join(chr(cp) for cp in range(0x10000) if not 0xD800 <= cp < 0xE000)
+
+
+def private_dirty_kb():
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Private_Dirty:"):
+                return int(line.split()[1])
+    raise RuntimeError("Private_Dirty not found")
+
+
+def worker(profiles):
+    before = private_dirty_kb()
+    for profile in profiles:
+        TEXT.translate(profile._table)
+    return private_dirty_kb() - before
+
+
+def main():
+    args = sys.argv[1:]
+    as_dict = "--dict" in args
+    args = [arg for arg in args if arg != "--dict"]
+    workers = int(args[0]) if args else 4
+
+    precis_i18n.warm_up(trace_memory=False)
+    profiles = []
+    for name in precis_i18n.factory._PROFILES:
+        profile = precis_i18n.get_profile(name)
+        if getattr(profile, "_table", False):
+            if as_dict:
+                profile._table = {
+                    cp: char
+                    for cp, char in enumerate(profile._table)
+                    if chr(cp) != char
+                }
+            profiles.append(profile)
+    # Warm the translation code paths in the parent, too.
+    worker(profiles)
+    gc.freeze()
+
+    results = []
+    for _ in range(workers):
+        rfd, wfd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(rfd)
+            os.write(wfd, str(worker(profiles)).encode())
+            os._exit(0)
+        os.close(wfd)
+        with os.fdopen(rfd) as f:
+            results.append(int(f.read()))
+        os.waitpid(pid, 0)
+
+    layout = "dict" if as_dict else "flat"
+    print(
+        "%s tables, %d profiles: Private_Dirty growth per worker %s kB"
+        % (layout, len(profiles), results)
+    )
+
+
+if __name__ == "__main__":
+    main()
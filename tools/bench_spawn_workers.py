@@ -0,0 +1,65 @@
+# Measure the table build time in workers started with 'spawn'.
+#
+# Each worker enforces one value with every profile and reports how long that
+# took. Without shared tables, every worker builds every profile's tables.
+# With --shared, the parent publishes its tables with `publish_tables`, and
+# the workers attach to them in the pool initializer.
+#
+#   PYTHONPATH=. python tools/bench_spawn_workers.py [--shared] [workers]
+
+import concurrent.futures
+import multiprocessing
+import sys
+import time
+
+import precis_i18n
+import precis_i18n.factory
+from precis_i18n.shared import attach_tables, publish_tables
+
+NAMES = list(precis_i18n.factory._PROFILES)
+
+
+def _attach(name):
+    start = time.perf_counter()
+    attach_tables(name)
+    _attach.seconds = time.perf_counter() - start
+
+
+_attach.seconds = 0.0
+
+
+def worker(_):
+    start = time.perf_counter()
+    for name in NAMES:
+        precis_i18n.get_profile(name).enforce("Juliet")
+    return _attach.seconds + time.perf_counter() - start
+
+
+def main():
+    args = sys.argv[1:]
+    shared = "--shared" in args
+    args = [arg for arg in args if arg != "--shared"]
+    workers = int(args[0]) if args else 4
+
+    start = time.perf_counter()
+    tables = publish_tables() if shared else None
+    publish = time.perf_counter() - start
+
+    options = {"mp_context": multiprocessing.get_context("spawn")}
+    if tables is not None:
+        options.update(initializer=_attach, initargs=(tables.name,))
+    try:
+        with concurrent.futures.ProcessPoolExecutor(workers, **options) as pool:
+            # Each worker handles exactly one task.
+            seconds = list(pool.map(worker, range(workers), chunksize=1))
+    finally:
+        if tables is not None:
+            tables.unlink()
+
+    print("%s tables: publish %.3fs" % ("shared" if shared else "private", publish))
+    print("per-worker build: %s" % ", ".join("%.3fs" % s for s in seconds))
+    print("total: %.3fs" % (publish + sum(seconds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Measure how `enforce` throughput scales with the number of threads.
+#
+# Each thread enforces the same list of usernames with one shared profile. The
+# profile's tables are built before timing starts, unless --cold is given, in
+# which case the threads race to build them. Pass --cache to enable the
+# profile's enforcement cache, which is sharded by key.
+#
+# With the GIL, throughput stays flat as threads are added. On a free-threaded
+# build (python3.13t and later), it should grow with the number of cores.
+#
+#   PYTHONPATH=. python tools/bench_threads.py [--cold] [--cache] [max_threads]
+
+import os
+import sys
+import threading
+import time
+
+import precis_i18n
+
+VALUES = [
+    "%s%d" % (name, i)
+    for i in range(500)
+    for name in ("Juliet", "Ünïcödé", "ΣΑΣ", "Zoë", "ユーザー", "user@example")
+]
+ROUNDS = 5
+
+
+def run(profile, threads):
+    barrier = threading.Barrier(threads + 1)
+
+    def _work():
+        barrier.wait()
+        for _ in range(ROUNDS):
+            for value in VALUES:
+                profile.enforce(value)
+
+    workers = [threading.Thread(target=_work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    args = sys.argv[1:]
+    cold = "--cold" in args
+    cache = "--cache" in args
+    args = [arg for arg in args if arg not in ("--cold", "--cache")]
+    max_threads = int(args[0]) if args else (os.cpu_count() or 1)
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    print(
+        "Python %s, GIL enabled: %s, CPUs: %s"
+        % (sys.version.split()[0], is_gil_enabled(), os.cpu_count())
+    )
+
+    baseline = None
+    for threads in range(1, max_threads + 1):
+        profile = precis_i18n.get_profile("UsernameCaseMapped", cached=False)
+        if cache:
+            profile.enable_cache()
+        if not cold:
+            profile.warm(trace_memory=False)
+        seconds = run(profile, threads)
+        rate = threads * ROUNDS * len(VALUES) / seconds
+        if baseline is None:
+            baseline = rate
+        print(
+            "%2d threads: %10.0f values/s  speedup %.2fx"
+            % (threads, rate, rate / baseline)
+        )
+
+
+if __name__ == "__main__":
+    main()